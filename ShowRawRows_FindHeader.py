@@ -1,28 +1,40 @@
-from google.oauth2.service_account import Credentials
-import gspread, os, itertools
-from pathlib import Path
+import os, itertools, re
+
+from auth import get_client
 
-BASE_DIR = Path(__file__).resolve().parent
-CREDS_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", str(BASE_DIR / "service_account.json"))
 DOC_ID = os.getenv("GOOGLE_SHEETS_DOC_ID")
 TAB = os.getenv("GOOGLE_SHEETS_TAB", "Orders")
 
-creds = Credentials.from_service_account_file(CREDS_FILE, scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"])
-gc = gspread.authorize(creds)
+gc = get_client()
 sh = gc.open_by_key(DOC_ID) if not (DOC_ID and DOC_ID.startswith("http")) else gc.open_by_url(DOC_ID)
-ws = sh.worksheet(TAB)
-data = ws.get_all_values()
-
-print(f"Total rows fetched: {len(data)}\n")
 
 keywords = ["sold date", "order id", "email", "confirm id", "revenue", "event", "site", "ticket", "venue"]
-matches = []
+pattern = re.compile("|".join(map(re.escape, keywords)))
+
+
+def fetch_values(a1_range):
+    resp = sh.values_batch_get(ranges=[a1_range])
+    return resp["valueRanges"][0].get("values", [])
 
-for i, row in enumerate(data):
-    lower_cells = [str(c).strip().lower() for c in row]
-    # match if any keyword appears in any cell
-    if any(any(k in cell for k in keywords) for cell in lower_cells):
-        matches.append(i)
+
+def find_header_rows(rows):
+    # match if any keyword appears in any cell: join each row once (the \x01
+    # separator keeps matches inside a cell), lowercase that single buffer and
+    # let the compiled alternation stop at the first hit
+    return [
+        i for i, row in enumerate(rows)
+        if pattern.search("\x01".join(map(str, row)).lower())
+    ]
+
+
+# headers normally sit near the top; only pull the whole tab if the window has none
+data = fetch_values(f"'{TAB}'!A1:Z200")
+matches = find_header_rows(data)
+if not matches:
+    data = fetch_values(f"'{TAB}'")
+    matches = find_header_rows(data)
+
+print(f"Total rows fetched: {len(data)}\n")
 
 if matches:
     print("Found candidate header rows at indices:", matches)
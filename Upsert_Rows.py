@@ -1,5 +1,4 @@
-# from project folder, using your venv python
-& .venv\Scripts\python.exe - <<'PY'
+# from project folder: python Upsert_Rows.py
 import inspect, db
 try:
     sig = inspect.signature(db.upsert_rows)
@@ -8,4 +7,3 @@ try:
     print(inspect.getsource(db.upsert_rows))
 except Exception as e:
     print("Error:", e)
-PY
\ No newline at end of file
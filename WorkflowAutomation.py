@@ -14,15 +14,36 @@ CREATE TABLE IF NOT EXISTS sheet_facts (
   col2 TEXT,
   col3 TEXT
 );
-CREATE INDEX IF NOT EXISTS idx_sheet_facts_rowhash ON sheet_facts(row_hash);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_sheet_facts_rowhash ON sheet_facts(row_hash);
+-- the unique index above also serves row_hash lookups, so the old plain one goes
+DROP INDEX IF EXISTS idx_sheet_facts_rowhash;
 """
 
-UPSERT_SQL = """
-INSERT INTO sheet_facts (row_hash, col1, col2, col3)
-SELECT :row_hash, :col1, :col2, :col3
-WHERE NOT EXISTS (SELECT 1 FROM sheet_facts WHERE row_hash = :row_hash);
+# Bulk upserts land in an unindexed temp table first and are merged with one
+# set-based INSERT OR IGNORE, so each row costs a single B-tree insert.
+STAGE_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS sheet_facts_stage (
+  row_hash TEXT NOT NULL,
+  col1 TEXT,
+  col2 TEXT,
+  col3 TEXT
+);
 """
 
+STAGE_INSERT_SQL = """
+INSERT INTO sheet_facts_stage (row_hash, col1, col2, col3)
+VALUES (:row_hash, :col1, :col2, :col3);
+"""
+
+MERGE_SQL = """
+INSERT OR IGNORE INTO sheet_facts (row_hash, col1, col2, col3)
+SELECT row_hash, col1, col2, col3 FROM sheet_facts_stage;
+"""
+
+# compiled once; the merge relies on the unique index on row_hash
+STAGE_INSERT_STMT = text(STAGE_INSERT_SQL)
+MERGE_STMT = text(MERGE_SQL)
+
 def init_db(engine):
     with engine.begin() as conn:
         for stmt in SCHEMA_SQL.strip().split(";"):
@@ -31,6 +52,12 @@ def init_db(engine):
                 conn.execute(text(s))
 
 def upsert_rows(engine, rows):
+    rows = list(rows)
+    if not rows:
+        return
+    # one transaction: stage via executemany, merge set-based, clear the stage
     with engine.begin() as conn:
-        for r in rows:
-            conn.execute(text(UPSERT_SQL), r)
+        conn.execute(text(STAGE_SQL))
+        conn.execute(STAGE_INSERT_STMT, rows)
+        conn.execute(MERGE_STMT)
+        conn.execute(text("DELETE FROM sheet_facts_stage"))
@@ -1,10 +1,28 @@
 import streamlit as st
 import pandas as pd
 import os
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import inspect
 from pathlib import Path
 from dotenv import load_dotenv
 
+from db import get_engine
+from schema import SCHEMA_MAP, coerce_df
+
+
+@st.cache_resource
+def _engine(db_url):
+    return get_engine(db_url)
+
+
+@st.cache_data(ttl=60)
+def _table_columns(db_url):
+    # column set of sheet_facts, inspected once per TTL instead of per load
+    inspector = inspect(_engine(db_url))
+    if "sheet_facts" not in inspector.get_table_names():
+        return None
+    return frozenset(c["name"] for c in inspector.get_columns("sheet_facts"))
+
+
 def run_analytics_app():
     """Run the Google Sheets Analytics app"""
     
@@ -14,50 +32,18 @@ def run_analytics_app():
     st.title("📊 Google Sheets Analytics")
 
     DB_URL = os.getenv("DB_URL", f"sqlite:///{BASE_DIR / 'data.db'}")
-    engine = create_engine(DB_URL, future=True)
-
-    # PRAGMA tuning for SQLite
-    with engine.begin() as conn:
-        conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
-        conn.exec_driver_sql("PRAGMA synchronous=NORMAL;")
+    engine = _engine(DB_URL)
 
     st.caption(f"Using database: {DB_URL}")
 
     # Optional: fail early with a clear message if the table isn't there
-    inspector = inspect(engine)
-    if "sheet_facts" not in inspector.get_table_names():
+    table_cols = _table_columns(DB_URL)
+    if table_cols is None:
         st.error("Table 'sheet_facts' not found in this database. Make sure ingest.py wrote to the same DB_URL shown above.")
         st.stop()
 
-    # Define your real schema mapping here.
-    SCHEMA_MAP = {
-        "Sold Date": ("sold_date", "datetime64[ns]"),
-        "Event Date": ("event_date", "datetime64[ns]"),
-        "Time": ("time", "string"),
-        "Site": ("site", "string"),
-        "Order ID": ("order_id", "Int64"),
-        "Confirm ID": ("confirm_id", "string"),
-        "Revenue": ("revenue", "float"),
-        "Cost": ("cost", "float"),
-        "CNT": ("cnt", "Int64"),
-        "CC": ("cc", "string"),
-        "Purch By": ("purch_by", "string"),
-        "Purch Date": ("purch_date", "datetime64[ns]"),
-        "Trans By": ("trans_by", "string"),
-        "Trans Date": ("trans_date", "datetime64[ns]"),
-        "Email": ("email", "string"),
-        "Event": ("event", "string"),
-        "Theater": ("theater", "string"),
-        "Section": ("section", "string"),
-        "Row": ("row", "string"),
-        "Venue": ("venue", "string"),
-        "Notes": ("notes", "string"),
-    }
-
     @st.cache_data(ttl=60)
     def load_data():
-        inspector = inspect(engine)
-        table_cols = [c["name"] for c in inspector.get_columns("sheet_facts")]
         desired = ["row_hash", "ingested_at"] + [dst for _, (dst, _) in SCHEMA_MAP.items()]
         cols = [c for c in desired if c in table_cols]
         if not cols:
@@ -66,26 +52,7 @@ def run_analytics_app():
         df = pd.read_sql(f"SELECT {cols_sql} FROM sheet_facts ORDER BY ingested_at DESC LIMIT 100000", engine)
 
         # Coerce dtypes based on SCHEMA_MAP
-        dst_dtype = {dst: dtype for _, (dst, dtype) in SCHEMA_MAP.items()}
-        for col, dtype in dst_dtype.items():
-            if col not in df.columns:
-                continue
-            try:
-                if dtype == "datetime64[ns]":
-                    df[col] = pd.to_datetime(df[col], errors="coerce")
-                elif dtype == "Int64":
-                    df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-                elif dtype == "float":
-                    df[col] = pd.to_numeric(df[col], errors="coerce")
-                else:
-                    df[col] = df[col].astype("string")
-            except Exception:
-                pass
-
-        if "ingested_at" in df.columns:
-            df["ingested_at"] = pd.to_datetime(df["ingested_at"], errors="coerce")
-
-        return df
+        return coerce_df(df, SCHEMA_MAP)
 
     df = load_data()
     st.write(f"Rows loaded: {len(df)}")
@@ -124,17 +91,18 @@ def run_analytics_app():
         sd_max = df["sold_date"].max().date()
         sold_from, sold_to = st.date_input("Sold Date range", [sd_min, sd_max])
 
-    # Apply filters
-    q = df.copy()
+    # Apply filters: compose one boolean mask and materialize the frame once
+    mask = pd.Series(True, index=df.index)
     if term and col3_name:
-        q = q[q[col3_name].astype(str).str.contains(term, case=False, na=False)]
+        mask &= df[col3_name].astype(str).str.contains(term, case=False, na=False)
     if term2 and col2_name:
-        q = q[q[col2_name].astype(str) == term2]
-    if rev_range and "revenue" in q.columns:
-        q = q[q["revenue"].between(rev_range[0], rev_range[1])]
-    if sold_from and sold_to and "sold_date" in q.columns:
-        q = q.dropna(subset=["sold_date"])
-        q = q[(q["sold_date"].dt.date >= sold_from) & (q["sold_date"].dt.date <= sold_to)]
+        mask &= df[col2_name].astype(str) == term2
+    if rev_range and "revenue" in df.columns:
+        mask &= df["revenue"].between(rev_range[0], rev_range[1], inclusive="both")
+    if sold_from and sold_to and "sold_date" in df.columns:
+        sold_day = df["sold_date"].dt.date
+        mask &= df["sold_date"].notna() & (sold_day >= sold_from) & (sold_day <= sold_to)
+    q = df.loc[mask]
 
     st.dataframe(q, use_container_width=True)
 
@@ -147,12 +115,10 @@ def run_analytics_app():
         st.line_chart(rev_ts["revenue"])
 
     if "ingested_at" in q.columns:
-        tmp = q.copy()
-        tmp["ingested_at"] = pd.to_datetime(tmp["ingested_at"], errors="coerce")
-        tmp = tmp.dropna(subset=["ingested_at"])
-        if not tmp.empty:
+        ingested = pd.to_datetime(q["ingested_at"], errors="coerce").dropna()
+        if not ingested.empty:
             daily = (
-                tmp.groupby(tmp["ingested_at"].dt.date)
+                ingested.groupby(ingested.dt.date)
                    .size()
                    .reset_index(name="rows")
             )
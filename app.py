@@ -1,11 +1,21 @@
 # app.py
 import os
+import re
 import pandas as pd
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import inspect, text
 import streamlit as st
 from pathlib import Path
+from datetime import timedelta
 from dotenv import load_dotenv
 
+from db import get_engine, read_parquet_partitions
+from schema import SCHEMA_MAP, DST_DTYPES
+
+try:
+    import duckdb  # optional: columnar reads straight from the SQLite file
+except ImportError:
+    duckdb = None
+
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
 
@@ -14,84 +24,200 @@ st.set_page_config(page_title="Google Sheets Analytics", layout="wide")
 st.title("📊 Google Sheets Analytics")
 
 DB_URL = os.getenv("DB_URL", f"sqlite:///{BASE_DIR / 'data.db'}")
-engine = create_engine(DB_URL, future=True)
+# Serve load_data from the Parquet partitions written at ingest (see db.PARQUET_DIR).
+# Run db.export_parquet_snapshot once first so they cover older rows.
+READ_PARQUET = os.getenv("READ_PARQUET", "").strip().lower() in ("1", "true", "yes")
+
+@st.cache_resource
+def get_engine_cached(db_url: str):
+    # one engine (and connection pool) per process; get_engine applies the
+    # SQLite PRAGMA tuning on every new connection
+    return get_engine(db_url)
+
 
-# PRAGMA tuning for SQLite
-with engine.begin() as conn:
-    conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
-    conn.exec_driver_sql("PRAGMA synchronous=NORMAL;")
+@st.cache_data(ttl=60)
+def get_table_names(db_url: str) -> list:
+    return inspect(get_engine_cached(db_url)).get_table_names()
+
+
+@st.cache_data(ttl=60)
+def get_table_columns(db_url: str, table: str) -> list:
+    return [c["name"] for c in inspect(get_engine_cached(db_url)).get_columns(table)]
+
+
+@st.cache_resource
+def get_duckdb():
+    con = duckdb.connect()
+    con.execute("INSTALL sqlite; LOAD sqlite;")
+    return con
+
+
+engine = get_engine_cached(DB_URL)
 
 st.caption(f"Using database: {DB_URL}")
 
 # Optional: fail early with a clear message if the table isn't there
-inspector = inspect(engine)
-if "sheet_facts" not in inspector.get_table_names():
+if "sheet_facts" not in get_table_names(DB_URL):
     st.error("Table 'sheet_facts' not found in this database. Make sure ingest.py wrote to the same DB_URL shown above.")
     st.stop()
 
-# Define your real schema mapping here.
-# Key = column name in DB (or Google Sheet header), value = (normalized_name, pandas_dtype)
-SCHEMA_MAP = {
-    "Sold Date": ("sold_date", "datetime64[ns]"),
-    "Event Date": ("event_date", "datetime64[ns]"),
-    "Time": ("time", "string"),
-    "Site": ("site", "string"),
-    "Order ID": ("order_id", "Int64"),
-    "Confirm ID": ("confirm_id", "string"),
-    "Revenue": ("revenue", "float"),
-    "Cost": ("cost", "float"),
-    "CNT": ("cnt", "Int64"),
-    "CC": ("cc", "string"),
-    "Purch By": ("purch_by", "string"),
-    "Purch Date": ("purch_date", "datetime64[ns]"),
-    "Trans By": ("trans_by", "string"),
-    "Trans Date": ("trans_date", "datetime64[ns]"),
-    "Email": ("email", "string"),
-    "Event": ("event", "string"),
-    "Theater": ("theater", "string"),
-    "Section": ("section", "string"),
-    "Row": ("row", "string"),
-    "Venue": ("venue", "string"),
-    "Notes": ("notes", "string"),
-}
+# Determine sensible default columns for KPI and counts (safe/fallback)
+possible_kpi_cols = ["customer_name", "purch_by", "trans_by", "email", "site", "event"]
+possible_count_cols = ["status", "event", "site", "venue", "theater"]
+
+def first_existing(candidates, dfcols):
+    for c in candidates:
+        if c in dfcols:
+            return c
+    return None
+
+table_cols = get_table_columns(DB_URL, "sheet_facts")
+col3_name = first_existing(possible_kpi_cols, table_cols)
+col2_name = first_existing(possible_count_cols, table_cols)
+
+
+@st.cache_data(ttl=60)
+def load_bounds():
+    """
+    Min/max of revenue and sold_date, used to seed the filter widgets without
+    loading the table.
+    """
+    bounds = {}
+    for col in ("revenue", "sold_date"):
+        if col in table_cols:
+            with engine.connect() as conn:
+                lo, hi = conn.execute(text(f"SELECT MIN({col}), MAX({col}) FROM sheet_facts")).one()
+            bounds[col] = (lo, hi)
+    return bounds
+
+
+def build_filters(term=None, term2=None, rev_range=None, sold_from=None, sold_to=None):
+    """
+    Translate the UI filter values into SQL predicates + bind params so SQLite
+    only returns (and pandas only coerces) the rows that will be displayed.
+    """
+    where = []
+    params = {}
+    if term and col3_name:
+        like = term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        where.append(f"lower({col3_name}) LIKE :term_like ESCAPE '\\'")
+        params["term_like"] = f"%{like}%"
+    if term2 and col2_name:
+        where.append(f"CAST({col2_name} AS TEXT) = :term2")
+        params["term2"] = term2
+    if rev_range and "revenue" in table_cols:
+        where.append("revenue BETWEEN :rev_lo AND :rev_hi")
+        params["rev_lo"], params["rev_hi"] = rev_range
+    if sold_from and sold_to and "sold_date" in table_cols:
+        # half-open range on the raw column keeps ix_sheet_facts_sold_date usable
+        where.append("sold_date >= :sd_lo AND sold_date < :sd_hi")
+        params["sd_lo"] = sold_from.isoformat()
+        params["sd_hi"] = (sold_to + timedelta(days=1)).isoformat()
+    return where, params
+
+
+def filter_frame(df, term=None, term2=None, rev_range=None, sold_from=None, sold_to=None):
+    """
+    In-memory counterpart of build_filters for frames read from Parquet.
+    """
+    mask = pd.Series(True, index=df.index)
+    if term and col3_name:
+        mask &= df[col3_name].astype("string").str.lower().str.contains(term.lower(), regex=False).fillna(False)
+    if term2 and col2_name:
+        mask &= (df[col2_name].astype("string") == term2).fillna(False)
+    if rev_range and "revenue" in df.columns:
+        mask &= pd.to_numeric(df["revenue"], errors="coerce").between(*rev_range)
+    if sold_from and sold_to and "sold_date" in df.columns:
+        sold = pd.to_datetime(df["sold_date"], errors="coerce")
+        mask &= (sold >= pd.Timestamp(sold_from)) & (sold < pd.Timestamp(sold_to + timedelta(days=1)))
+    q = df.loc[mask]
+    if "ingested_at" in q.columns:
+        q = q.sort_values("ingested_at", ascending=False, kind="stable")
+    return q.head(100000).reset_index(drop=True)
+
+
+def read_sheet_facts_duckdb(sql, params):
+    """
+    Run a SELECT against sheet_facts through DuckDB's sqlite_scan and return an
+    Arrow-backed frame, or None when DuckDB isn't available for this DB.
+    """
+    if duckdb is None or engine.url.get_backend_name() != "sqlite" or not engine.url.database:
+        return None
+    db_path = engine.url.database.replace("'", "''")
+    duck_sql = re.sub(r":(\w+)", r"$\1", sql).replace(
+        "FROM sheet_facts", f"FROM sqlite_scan('{db_path}', 'sheet_facts')"
+    )
+    try:
+        cur = get_duckdb().cursor()
+        return cur.execute(duck_sql, params).fetch_arrow_table().to_pandas(types_mapper=pd.ArrowDtype)
+    except Exception:
+        # e.g. a column whose stored values don't match its declared type
+        return None
+
 
 @st.cache_data(ttl=60)
-def load_data():
+def load_data(term=None, term2=None, rev_range=None, sold_from=None, sold_to=None):
     # Build a safe SELECT that only requests columns present in the DB
-    inspector = inspect(engine)
-    table_cols = [c["name"] for c in inspector.get_columns("sheet_facts")]
     desired = ["row_hash", "ingested_at"] + [dst for _, (dst, _) in SCHEMA_MAP.items()]
     cols = [c for c in desired if c in table_cols]
     if not cols:
         return pd.DataFrame(columns=desired)
     cols_sql = ", ".join(cols)
-    df = pd.read_sql(f"SELECT {cols_sql} FROM sheet_facts ORDER BY ingested_at DESC LIMIT 100000", engine)
-
-    # Coerce dtypes based on SCHEMA_MAP
-    dst_dtype = {dst: dtype for _, (dst, dtype) in SCHEMA_MAP.items()}
-    for col, dtype in dst_dtype.items():
-        if col not in df.columns:
-            continue
-        try:
-            if dtype == "datetime64[ns]":
+
+    where, params = build_filters(term, term2, rev_range, sold_from, sold_to)
+    where_sql = f"WHERE {' AND '.join(where)} " if where else ""
+
+    sql = f"SELECT {cols_sql} FROM sheet_facts {where_sql}ORDER BY ingested_at DESC LIMIT 100000"
+
+    # Arrow-backed columns come back already typed (and far smaller than object
+    # strings); parse_dates handles the datetime columns with errors coerced.
+    parse_dates = [c for c in cols if DST_DTYPES.get(c) == "datetime64[ns]"]
+    df = None
+    if READ_PARQUET:
+        df = read_parquet_partitions(cols)
+        if df is not None:
+            df = filter_frame(df, term, term2, rev_range, sold_from, sold_to)
+    if df is None:
+        df = read_sheet_facts_duckdb(sql, params)
+    if df is None:
+        df = pd.read_sql(text(sql), engine, params=params, parse_dates=parse_dates, dtype_backend="pyarrow")
+    else:
+        for col in parse_dates:
+            if not pd.api.types.is_datetime64_any_dtype(df[col]):
                 df[col] = pd.to_datetime(df[col], errors="coerce")
-            elif dtype == "Int64":
-                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-            elif dtype == "float":
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-            else:
-                df[col] = df[col].astype("string")
-        except Exception:
-            # best-effort coercion; ignore failures
-            pass
-
-    if "ingested_at" in df.columns:
-        df["ingested_at"] = pd.to_datetime(df["ingested_at"], errors="coerce")
+
+    # Numeric columns only need coercing when mixed content made them arrive as strings
+    for col in df.columns:
+        if DST_DTYPES.get(col) in ("Int64", "float") and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], errors="coerce")
 
     return df
 
-df = load_data()
-st.write(f"Rows loaded: {len(df)}")
+
+def _daily_series(date_col, value_sql, filters):
+    where, params = build_filters(*filters)
+    where.append(f"{date_col} IS NOT NULL")
+    sql = (
+        f"SELECT date({date_col}) AS d, {value_sql} AS v FROM sheet_facts "
+        f"WHERE {' AND '.join(where)} GROUP BY d ORDER BY d"
+    )
+    df = pd.read_sql(text(sql), engine, params=params, parse_dates=["d"])
+    return df.set_index("d")["v"]
+
+
+@st.cache_data(ttl=60)
+def daily_revenue(*filters):
+    # revenue summed per Sold Date, aggregated by SQLite
+    return _daily_series("sold_date", "SUM(revenue)", filters).dropna().rename("revenue")
+
+
+@st.cache_data(ttl=60)
+def daily_ingest_counts(*filters):
+    # rows ingested per calendar day, aggregated by SQLite
+    return _daily_series("ingested_at", "COUNT(*)", filters).rename("rows")
+
+
+bounds = load_bounds()
 
 # Basic text filters and UI defaults (replace previous block)
 col1, col2, col3 = st.columns(3)
@@ -101,71 +227,42 @@ with col2:
     term2 = st.text_input("Filter: exact match (applies to second categorical column)")
 with col3:
     # Revenue range slider if revenue exists
-    if "revenue" in df.columns and not df["revenue"].dropna().empty:
-        rev_min = float(df["revenue"].min())
-        rev_max = float(df["revenue"].max())
+    rev_min, rev_max = bounds.get("revenue", (None, None))
+    if rev_min is not None:
+        rev_min = float(rev_min)
+        rev_max = float(rev_max)
         rev_range = st.slider("Revenue range", rev_min, rev_max, (rev_min, rev_max))
     else:
         rev_range = None
 
-# Determine sensible default columns for KPI and counts (safe/fallback)
-possible_kpi_cols = ["customer_name", "purch_by", "trans_by", "email", "site", "event"]
-possible_count_cols = ["status", "event", "site", "venue", "theater"]
-
-def first_existing(candidates, dfcols):
-    for c in candidates:
-        if c in dfcols:
-            return c
-    return None
-
-col3_name = first_existing(possible_kpi_cols, df.columns)
-col2_name = first_existing(possible_count_cols, df.columns)
-
 # Sold Date range filter if available
 sold_from = sold_to = None
-if "sold_date" in df.columns and not df["sold_date"].dropna().empty:
-    sd_min = df["sold_date"].min().date()
-    sd_max = df["sold_date"].max().date()
+sd_min, sd_max = bounds.get("sold_date", (None, None))
+if sd_min is not None:
+    sd_min = pd.to_datetime(sd_min).date()
+    sd_max = pd.to_datetime(sd_max).date()
     sold_from, sold_to = st.date_input("Sold Date range", [sd_min, sd_max])
 
-q = df.copy()
-# Apply filters only if target columns exist
-if term and col3_name:
-    q = q[q[col3_name].astype(str).str.contains(term, case=False, na=False)]
-if term2 and col2_name:
-    q = q[q[col2_name].astype(str) == term2]
-if rev_range and "revenue" in q.columns:
-    q = q[q["revenue"].between(rev_range[0], rev_range[1])]
-if sold_from and sold_to and "sold_date" in q.columns:
-    q = q.dropna(subset=["sold_date"])
-    q = q[(q["sold_date"].dt.date >= sold_from) & (q["sold_date"].dt.date <= sold_to)]
+q = load_data(term, term2, rev_range, sold_from, sold_to)
+st.write(f"Rows loaded: {len(q)}")
 
 st.dataframe(q, use_container_width=True)
 
+filters = (term, term2, rev_range, sold_from, sold_to)
+
 # Revenue time series (by Sold Date) if available
-if "sold_date" in q.columns and "revenue" in q.columns and not q[["sold_date", "revenue"]].dropna().empty:
-    rev_ts = q.dropna(subset=["sold_date", "revenue"]).groupby(q["sold_date"].dt.date)["revenue"].sum().reset_index()
-    rev_ts["sold_date"] = pd.to_datetime(rev_ts["sold_date"])
-    rev_ts = rev_ts.set_index("sold_date").sort_index()
-    st.subheader("Revenue by Sold Date")
-    st.line_chart(rev_ts["revenue"])
+if "sold_date" in table_cols and "revenue" in table_cols:
+    rev_ts = daily_revenue(*filters)
+    if not rev_ts.empty:
+        st.subheader("Revenue by Sold Date")
+        st.line_chart(rev_ts)
 
 # Rows ingested per day
-if "ingested_at" in q.columns:
-    tmp = q.copy()
-    tmp["ingested_at"] = pd.to_datetime(tmp["ingested_at"], errors="coerce")
-    tmp = tmp.dropna(subset=["ingested_at"])
-    if not tmp.empty:
-        daily = (
-            tmp.groupby(tmp["ingested_at"].dt.date)
-               .size()
-               .reset_index(name="rows")
-        )
-        # ensure a proper datetime index for plotting
-        daily["ingested_at"] = pd.to_datetime(daily["ingested_at"])
-        daily = daily.sort_values("ingested_at").set_index("ingested_at")
+if "ingested_at" in table_cols:
+    daily = daily_ingest_counts(*filters)
+    if not daily.empty:
         st.subheader("Rows ingested per day")
-        st.bar_chart(daily["rows"])
+        st.bar_chart(daily)
     else:
         st.caption("No ingested_at timestamps available to chart.")
 else:
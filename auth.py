@@ -0,0 +1,78 @@
+# auth.py
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import gspread
+from dotenv import load_dotenv
+from google.auth.transport.requests import AuthorizedSession
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# load .env from project root so GOOGLE_APPLICATION_CREDENTIALS set there is seen
+load_dotenv(BASE_DIR / ".env")
+
+CREDS_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "service_account.json")
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+# revision lookups only need file metadata
+DRIVE_SCOPES = ["https://www.googleapis.com/auth/drive.metadata.readonly"]
+
+# keep-alive pool shared by every Sheets call in the process; retries cover
+# the rate-limit (429) and transient 5xx responses the API returns under load
+POOL_SIZE = 32
+RETRY = Retry(total=5, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+
+# resolve relative creds file path
+if not os.path.isabs(CREDS_FILE):
+    CREDS_FILE = str((BASE_DIR / CREDS_FILE).resolve())
+
+
+@lru_cache(maxsize=1)
+def get_client() -> gspread.Client:
+    """
+    Return an authorized gspread client. The service-account key is parsed and
+    authorized once per process; later callers reuse the same client, token and
+    pooled HTTPS connections.
+    """
+    creds = Credentials.from_service_account_file(CREDS_FILE, scopes=SCOPES)
+    session = AuthorizedSession(creds)
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=RETRY)
+    session.mount("https://", adapter)
+    return gspread.Client(auth=creds, session=session)
+
+
+# Drive services by (service account, scopes). googleapiclient's httplib2
+# transport is not thread-safe, so requests on them are serialized.
+_DRIVES = {}
+_DRIVE_LOCK = threading.Lock()
+
+
+def get_drive(credentials: Optional[Credentials] = None):
+    """
+    Return a Drive v3 service, built once per service account and scope set
+    and reused by later callers. Without `credentials` it uses the
+    service-account key with read-only metadata scope.
+    """
+    from googleapiclient.discovery import build
+
+    if credentials is None:
+        credentials = Credentials.from_service_account_file(CREDS_FILE, scopes=DRIVE_SCOPES)
+    key = (credentials.service_account_email, tuple(credentials.scopes or ()))
+    with _DRIVE_LOCK:
+        if key not in _DRIVES:
+            _DRIVES[key] = build("drive", "v3", credentials=credentials, cache_discovery=False)
+        return _DRIVES[key]
+
+
+def sheet_revision(doc_id: str, credentials: Optional[Credentials] = None) -> str:
+    """Drive headRevisionId of the spreadsheet: one small metadata call."""
+    drive = get_drive(credentials)
+    with _DRIVE_LOCK:
+        meta = drive.files().get(fileId=doc_id, fields="headRevisionId,modifiedTime").execute()
+    # native Sheets may omit headRevisionId; modifiedTime changes on every edit too
+    return str(meta.get("headRevisionId") or meta["modifiedTime"])
@@ -6,17 +6,34 @@ from datetime import datetime
 from check_account_availability import (
     load_accounts_from_sheet,
     load_orders_from_db,
-    check_email_availability,
+    check_emails_availability,
 )
-from db import get_engine
+from db import get_engine, DEFAULT_DB_URL
 
 st.set_page_config(page_title="Account Availability Checker", layout="wide")
+
+
+@st.cache_resource
+def _engine(db_url):
+    # one engine per process; reruns and TTL refreshes reuse its pool
+    return get_engine(db_url)
+
+
+@st.cache_data(ttl=300)
+def _cached_orders(db_url):
+    return load_orders_from_db(_engine(db_url))
+
+
+@st.cache_data(ttl=300)
+def _cached_accounts(doc_id, tab):
+    return load_accounts_from_sheet(doc_id, tab)
+
+
 st.title("Account Availability Checker")
 
 st.sidebar.header("Prospective purchase")
 # We'll load existing events/theaters from Orders to populate helpers.
-engine_preview = get_engine()
-orders_preview = load_orders_from_db(engine_preview)
+orders_preview = _cached_orders(DEFAULT_DB_URL)
 existing_theaters = []
 existing_events = []
 if orders_preview is not None and not orders_preview.empty:
@@ -40,6 +57,8 @@ st.sidebar.header("Data sources")
 doc_id = st.sidebar.text_input("Google Sheets DOC_ID (optional)")
 accounts_tab = st.sidebar.text_input("Accounts tab name", value="Accounts")
 accounts_csv_file = st.sidebar.file_uploader("Optional: upload Accounts CSV (uses 'email' column or first column)", type=["csv"])
+if st.sidebar.button("Invalidate cache"):
+    st.cache_data.clear()
 
 if st.sidebar.button("Run check"):
     today = pd.Timestamp.utcnow()
@@ -56,30 +75,32 @@ if st.sidebar.button("Run check"):
             emails = df_acc.iloc[:, 0].astype("string").dropna().str.strip().str.lower().drop_duplicates().reset_index(drop=True)
     else:
         try:
-            emails = load_accounts_from_sheet(doc_id or None, accounts_tab)
+            emails = _cached_accounts(doc_id or None, accounts_tab)
         except Exception as e:
             st.error(f"Failed to load Accounts tab: {e}")
             st.stop()
 
-    engine = get_engine()
-    orders = load_orders_from_db(engine)
+    orders = _cached_orders(DEFAULT_DB_URL)
 
     available = []
     unavailable = {}
     ed_ts = pd.to_datetime(event_date)
     sd_ts = pd.to_datetime(sold_date)
 
+    # orders come normalized from load_orders_from_db, so check every email in one pass
+    emails = list(emails)
+    results = check_emails_availability(
+        emails,
+        orders,
+        today,
+        event=event or None,
+        theater=theater or None,
+        event_date=ed_ts,
+        cnt_new=int(cnt),
+        sold_date_new=sd_ts,
+    )
     for e in emails:
-        ok, reasons = check_email_availability(
-            e,
-            orders,
-            today,
-            event=event or None,
-            theater=theater or None,
-            event_date=ed_ts,
-            cnt_new=int(cnt),
-            sold_date_new=sd_ts,
-        )
+        ok, reasons = results[e]
         if ok:
             available.append(e)
         else:
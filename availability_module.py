@@ -4,9 +4,25 @@ from datetime import datetime
 from check_account_availability import (
     load_accounts_from_sheet,
     load_orders_from_db,
-    check_email_availability,
+    check_emails_availability,
 )
-from db import get_engine
+from db import get_engine, DEFAULT_DB_URL
+
+
+@st.cache_resource
+def _engine(db_url):
+    # one engine per process; reruns and TTL refreshes reuse its pool
+    return get_engine(db_url)
+
+
+@st.cache_data(ttl=300)
+def _cached_orders(db_url):
+    return load_orders_from_db(_engine(db_url))
+
+
+@st.cache_data(ttl=300)
+def _cached_accounts(doc_id, tab):
+    return load_accounts_from_sheet(doc_id, tab)
 
 def run_availability_app():
     """Run the Account Availability Checker app"""
@@ -15,8 +31,7 @@ def run_availability_app():
 
     st.sidebar.header("Prospective purchase")
     # We'll load existing events/theaters from Orders to populate helpers.
-    engine_preview = get_engine()
-    orders_preview = load_orders_from_db(engine_preview)
+    orders_preview = _cached_orders(DEFAULT_DB_URL)
     existing_theaters = []
     existing_events = []
     if orders_preview is not None and not orders_preview.empty:
@@ -40,6 +55,8 @@ def run_availability_app():
     doc_id = st.sidebar.text_input("Google Sheets DOC_ID (optional)")
     accounts_tab = st.sidebar.text_input("Accounts tab name", value="Accounts")
     accounts_csv_file = st.sidebar.file_uploader("Optional: upload Accounts CSV (uses 'email' column or first column)", type=["csv"])
+    if st.sidebar.button("Invalidate cache"):
+        st.cache_data.clear()
 
     if st.sidebar.button("Run check"):
         today = pd.Timestamp.utcnow()
@@ -66,7 +83,7 @@ def run_availability_app():
                 return
                 
             try:
-                df_acc = load_accounts_from_sheet(doc_id, accounts_tab)
+                df_acc = _cached_accounts(doc_id, accounts_tab)
                 if df_acc is None or df_acc.empty:
                     st.warning(f"No accounts found in Google Sheets tab '{accounts_tab}'")
                     return
@@ -85,45 +102,42 @@ def run_availability_app():
 
         # Load existing orders from database
         try:
-            engine = get_engine()
-            existing_orders = load_orders_from_db(engine)
+            existing_orders = _cached_orders(DEFAULT_DB_URL)
             if existing_orders is None:
                 existing_orders = pd.DataFrame()
         except Exception as e:
             st.error(f"Failed to load existing orders: {e}")
             return
 
-        # Check availability for each email
-        results = []
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i, email in enumerate(emails):
-            status_text.text(f"Checking {i+1}/{len(emails)}: {email}")
-            progress_bar.progress((i + 1) / len(emails))
-            
-            is_available, reason = check_email_availability(
-                email=email,
-                event=event,
-                theater=theater,
-                event_date=event_date,
-                sold_date=sold_date,
-                cnt=cnt,
-                existing_orders=existing_orders
+        # Check availability for all emails in one vectorized pass over the orders.
+        ed_ts = pd.to_datetime(event_date)
+        sd_ts = pd.to_datetime(sold_date)
+        keys = [email.strip().lower() for email in emails]
+        with st.spinner(f"Checking {len(emails)} emails..."):
+            verdicts = check_emails_availability(
+                keys,
+                existing_orders,
+                today,
+                event=event or None,
+                theater=theater or None,
+                event_date=ed_ts,
+                cnt_new=int(cnt),
+                sold_date_new=sd_ts,
             )
-            
+
+        results = []
+        for email, key in zip(emails, keys):
+            is_available, reasons = verdicts[key]
             results.append({
                 "email": email,
                 "available": is_available,
-                "reason": reason,
+                "reason": "; ".join(reasons),
                 "event": event,
                 "theater": theater,
                 "event_date": event_date,
                 "cnt": cnt
             })
-        
-        status_text.text("Check completed!")
-        
+
         # Display results
         results_df = pd.DataFrame(results)
         
@@ -18,15 +18,28 @@ can also point to a CSV of accounts via --accounts-csv.
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import argparse
+import logging
 import sys
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from ingest import fetch_sheet, DOC_ID as ENV_DOC_ID
-from db import get_engine
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the Rule 2 kernel then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+from sqlalchemy import bindparam, text
+
+import sheet_cache
+from auth import sheet_revision
+from ingest import fetch_sheet, _extract_sheet_key, DOC_ID as ENV_DOC_ID
+from db import get_engine, EMAIL_KEY_SQL
 
 # Prefer GOOGLE_SERVICE_ACCOUNT_JSON (set by deployment) or GOOGLE_APPLICATION_CREDENTIALS
 # If GOOGLE_SERVICE_ACCOUNT_JSON contains JSON content, write it to /app/service_account.json
@@ -50,10 +63,32 @@ if _gsa_json:
         pass
 
 
-def load_accounts_from_sheet(doc_id: Optional[str], tab: str = "Accounts") -> pd.Series:
+def load_accounts_from_sheet(doc_id: Optional[str], tab: str = "Accounts", use_cache: bool = True) -> pd.Series:
     key = doc_id or ENV_DOC_ID
     if not key:
         raise RuntimeError("No DOC_ID provided and GOOGLE_SHEETS_DOC_ID not set in .env")
+    folder = None
+    if use_cache:
+        try:
+            sheet_key = _extract_sheet_key(key)
+            folder = sheet_cache.revision_dir(sheet_key, f"accounts-{tab}", sheet_revision(sheet_key))
+            frames = sheet_cache.load_frames(folder)
+            if frames is not None:
+                return frames["accounts"]["email"].astype("string")
+        except Exception as ex:
+            # no Drive access or unreadable cache: fetch the sheet uncached
+            logging.warning("Accounts cache unavailable: %s", ex)
+            folder = None
+    emails = _fetch_accounts(key, tab)
+    if folder is not None:
+        try:
+            sheet_cache.save_frames(folder, {"accounts": pd.DataFrame({"email": emails})})
+        except Exception as ex:
+            logging.warning("Could not write accounts cache %s: %s", folder, ex)
+    return emails
+
+
+def _fetch_accounts(key: str, tab: str) -> pd.Series:
     df = fetch_sheet(key, tab)
     if df is None or df.empty:
         return pd.Series(dtype="string")
@@ -78,29 +113,119 @@ def load_accounts_from_sheet(doc_id: Optional[str], tab: str = "Accounts") -> pd
     return emails.drop_duplicates().reset_index(drop=True)
 
 
-def load_orders_from_db(engine) -> pd.DataFrame:
+def _naive(s: pd.Series) -> pd.Series:
+    # compare wall-clock dates regardless of whether the column is tz-aware
+    if getattr(s.dt, "tz", None) is not None:
+        return s.dt.tz_localize(None)
+    return s
+
+
+def _naive_ts(ts) -> pd.Timestamp:
+    ts = pd.Timestamp(ts)
+    return ts.tz_localize(None) if ts.tzinfo is not None else ts
+
+
+def _active_mask(event_dates: pd.Series, today_day: pd.Timestamp) -> np.ndarray:
+    # rows with no event date, or an event on/after today's midnight; plain
+    # datetime64 compares (event >= midnight <=> event day >= today)
+    ev = _naive(event_dates).to_numpy()
+    return np.isnat(ev) | (ev >= today_day.to_datetime64())
+
+
+ORDER_COLUMNS = ["email", "cnt", "event", "theater", "event_date", "sold_date", "ingested_at"]
+
+
+def _normalize_orders(orders) -> pd.DataFrame:
+    """Return `orders` with the columns and dtypes the availability checks expect.
+
+    Tests may pass an empty DataFrame with no columns; missing columns are
+    added empty. Run once per frame, not once per email.
+    """
+    if not isinstance(orders, pd.DataFrame):
+        orders = pd.DataFrame(orders)
+    missing = [c for c in ORDER_COLUMNS if c not in orders.columns]
+    if missing:
+        orders = orders.assign(**{c: pd.Series(dtype="object", index=orders.index) for c in missing})
+    return orders.assign(
+        event_date=pd.to_datetime(orders["event_date"], errors="coerce"),
+        sold_date=pd.to_datetime(orders["sold_date"], errors="coerce"),
+        ingested_at=pd.to_datetime(orders["ingested_at"], errors="coerce"),
+        cnt=pd.to_numeric(orders["cnt"], errors="coerce").fillna(1).astype("Int64"),
+        email=orders["email"].astype("string").str.strip().str.lower(),
+    )
+
+
+# stay well under SQLite's bound-parameter limit per IN (...) list
+EMAIL_BATCH = 500
+# smallest email shard worth a worker process in check_emails_availability_parallel
+MIN_SHARD = 2000
+READ_CHUNKSIZE = 50_000
+
+
+def load_orders_from_db(engine, emails: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Read orders typed for the availability checks.
+
+    Datetimes are parsed, email is stripped/lowercased and cnt is Int64.
+    Nothing here depends on the current date, so the frame stays valid
+    however long callers cache it. When `emails` is given only those
+    accounts' rows are read.
+    """
     # Read relevant columns from sheet_facts
-    cols = ["email", "cnt", "event", "theater", "event_date", "sold_date", "ingested_at"]
+    cols = ORDER_COLUMNS
+    read_kwargs = dict(
+        chunksize=READ_CHUNKSIZE,
+        parse_dates=["event_date", "sold_date", "ingested_at"],
+        dtype={"email": "string"},
+    )
+    sql = f"SELECT {', '.join(cols)} FROM sheet_facts"
+    # pre-sorted the way Rule 2 walks it; served by ix_sheet_facts_email_sold
+    order_sql = f"ORDER BY {EMAIL_KEY_SQL}, sold_date"
+    if emails is None:
+        statements = [(text(f"{sql} {order_sql}"), {})]
+    else:
+        keys = sorted({str(e).strip().lower() for e in emails})
+        stmt = text(f"{sql} WHERE {EMAIL_KEY_SQL} IN :emails {order_sql}").bindparams(bindparam("emails", expanding=True))
+        statements = [(stmt, {"emails": keys[i:i + EMAIL_BATCH]}) for i in range(0, len(keys), EMAIL_BATCH)]
     with engine.connect() as conn:
         try:
-            df = pd.read_sql(f"SELECT {', '.join(cols)} FROM sheet_facts", conn)
+            chunks = [
+                chunk
+                for stmt, params in statements
+                for chunk in pd.read_sql(stmt, conn, params=params, **read_kwargs)
+            ]
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=cols)
         except Exception:
             # fallback: read all and then subset
             df = pd.read_sql("SELECT * FROM sheet_facts", conn)
             df = df[[c for c in cols if c in df.columns]]
-
-    # normalize
-    for d in ("event_date", "sold_date", "ingested_at"):
-        if d in df.columns:
-            df[d] = pd.to_datetime(df[d], errors="coerce")
-    if "cnt" in df.columns:
-        df["cnt"] = pd.to_numeric(df["cnt"], errors="coerce").fillna(1).astype("Int64")
-    else:
-        df["cnt"] = 1
-    df["email"] = df["email"].astype("string").str.strip().str.lower()
+            if emails is not None and "email" in df.columns:
+                df = df[df["email"].astype("string").str.strip().str.lower().isin(set(keys))]
+
+    df = _normalize_orders(df)
+    # compact dtypes: small ints for cnt, low-cardinality keys as categoricals
+    df["cnt"] = pd.to_numeric(df["cnt"], downcast="integer")
+    for c in ("email", "event", "theater"):
+        df[c] = df[c].astype("category")
     return df
 
 
+def known_emails(engine, emails: Iterable[str]) -> set:
+    """Return the normalized keys from `emails` that have any row in sheet_facts.
+
+    Uses the email expression index; emails outside this set have no orders,
+    so only the prospective purchase itself can make them unavailable.
+    """
+    keys = sorted({str(e).strip().lower() for e in emails})
+    stmt = text(f"SELECT DISTINCT {EMAIL_KEY_SQL} FROM sheet_facts WHERE {EMAIL_KEY_SQL} IN :emails").bindparams(
+        bindparam("emails", expanding=True)
+    )
+    found = set()
+    with engine.connect() as conn:
+        for i in range(0, len(keys), EMAIL_BATCH):
+            found.update(conn.execute(stmt, {"emails": keys[i:i + EMAIL_BATCH]}).scalars())
+    return found
+
+
 def check_email_availability(
     email: str,
     orders: pd.DataFrame,
@@ -110,116 +235,217 @@ def check_email_availability(
     event_date: Optional[pd.Timestamp] = None,
     cnt_new: int = 1,
     sold_date_new: Optional[pd.Timestamp] = None,
+    early_exit: bool = False,
 ) -> Tuple[bool, List[str]]:
     """Return (available, reasons)
 
-    Assumptions documented in code comments and printed as reasons when
-    applicable.
+    Accepts raw or normalized orders; callers checking many emails should
+    normalize once (load_orders_from_db does) and use check_emails_availability.
     """
-    reasons: List[str] = []
-    # Normalize incoming orders DataFrame: tests may pass an empty DataFrame with no columns
-    if not isinstance(orders, pd.DataFrame):
-        orders = pd.DataFrame(orders)
-    orders = orders.copy()
-    required_cols = ["email", "cnt", "event", "theater", "event_date", "sold_date", "ingested_at"]
-    for c in required_cols:
-        if c not in orders.columns:
-            orders[c] = pd.Series(dtype="object")
-
-    # Normalize common types used by the checks
-    for dcol in ("event_date", "sold_date", "ingested_at"):
-        orders[dcol] = pd.to_datetime(orders[dcol], errors="coerce")
-    if "cnt" in orders.columns:
-        orders["cnt"] = pd.to_numeric(orders["cnt"], errors="coerce").fillna(1).astype("Int64")
-    else:
-        orders["cnt"] = 1
-    orders["email"] = orders["email"].astype("string").str.strip().str.lower()
-    o = orders[orders["email"] == email].copy()
+    return _check_one(
+        email,
+        _normalize_orders(orders),
+        today,
+        event=event,
+        theater=theater,
+        event_date=event_date,
+        cnt_new=cnt_new,
+        sold_date_new=sold_date_new,
+        early_exit=early_exit,
+    )
+
+
+def _check_one(email: str, orders: pd.DataFrame, today: pd.Timestamp, **prospective) -> Tuple[bool, List[str]]:
+    # numpy equality over the email array: no index alignment, no copy of the frame
+    own = orders.loc[orders["email"].to_numpy(dtype=object, na_value=None) == email]
+    return check_emails_availability([email], own, today, **prospective)[email]
+
+
+@njit(cache=True, nogil=True)
+def _rule2_violates(dates_ns, ends_ns, cnts, limit):
+    # any 6-month span [dates[i], ends[i]) holding > limit tickets.
+    # dates must be sorted ascending: the right edge j only moves forward and
+    # the running total drops cnts[i] as the window start advances.
+    n = dates_ns.shape[0]
+    j = 0
+    total = 0
+    for i in range(n):
+        while j < n and dates_ns[j] < ends_ns[i]:
+            total += cnts[j]
+            j += 1
+        if total > limit:
+            return True
+        total -= cnts[i]
+    return False
+
+
+def _drop_unavailable(o: pd.DataFrame, reasons: Dict[str, List[str]]):
+    # early exit: rows of emails that already failed a rule skip the costlier ones
+    failed = [e for e, r in reasons.items() if r]
+    if failed:
+        o = o[~o["email"].isin(failed)]
+    codes, keys = pd.factorize(o["email"])
+    return o, codes, np.asarray(keys, dtype=object), len(keys)
+
+
+def check_emails_availability(
+    emails: Iterable[str],
+    orders: pd.DataFrame,
+    today: pd.Timestamp,
+    event: Optional[str] = None,
+    theater: Optional[str] = None,
+    event_date: Optional[pd.Timestamp] = None,
+    cnt_new: int = 1,
+    sold_date_new: Optional[pd.Timestamp] = None,
+    early_exit: bool = False,
+) -> Dict[str, Tuple[bool, List[str]]]:
+    """Return {email: (available, reasons)} for every email in `emails`.
+
+    `orders` must already be normalized (load_orders_from_db or
+    _normalize_orders). The rules are evaluated for all emails in one pass
+    over `orders` (groupby aggregations keyed by email) rather than
+    re-filtering the frame once per email. Assumptions are documented in code
+    comments and printed as reasons when applicable.
+
+    Rules run cheapest first (1, 2, 3). With `early_exit`, an email that
+    fails a rule is not evaluated against the later ones, so its reasons
+    list only the first failing rule.
+    """
+    # repeated emails are checked once: reasons are keyed by email
+    emails = list(dict.fromkeys(emails))
+    reasons: Dict[str, List[str]] = {e: [] for e in emails}
+    # hash-join against the accounts under evaluation
+    o = orders[orders["email"].isin(set(emails))]
+    # per-email index built once: every rule below groups by these integer codes
+    codes, keys = pd.factorize(o["email"])
+    keys = np.asarray(keys, dtype=object)
+    n_keys = len(keys)
+    # all date comparisons are on naive (UTC wall-clock) timestamps
+    today_naive = _naive_ts(today)
+    today_day = today_naive.normalize()
+    event_dates = _naive(o["event_date"])
 
     # Rule 1: active tickets (event_date >= today) sum(cnt) + prospective cnt_new <= 8
     # Assumption: missing event_date on existing rows -> treat as active (CNT applies)
-    if not o.empty:
-        active_mask = (o["event_date"].isna()) | (o["event_date"].dt.date >= today.date())
-        active_tickets_existing = int(o.loc[active_mask, "cnt"].sum()) if not o.loc[active_mask].empty else 0
-    else:
-        active_tickets_existing = 0
+    # computed from `today` on every call: cached orders must not pin the date
+    active_mask = _active_mask(event_dates, today_day)
+    cnt = o["cnt"].to_numpy(dtype=np.int64)
+    active_existing = pd.Series(
+        np.bincount(codes[active_mask], weights=cnt[active_mask], minlength=n_keys).astype(np.int64),
+        index=keys,
+    )
 
     # Determine if the prospective purchase counts as active: event_date missing or in future/today
-    prospective_counts_as_active = False
     if event_date is None:
         # conservative: assume it would count as active
         prospective_counts_as_active = True
     else:
         prospective_counts_as_active = event_date.date() >= today.date()
 
-    active_tickets = active_tickets_existing + (cnt_new if prospective_counts_as_active else 0)
-    if active_tickets > 8:
-        reasons.append(f"Rule1: active tickets including new={active_tickets} > 8")
+    active_tickets = active_existing.reindex(emails, fill_value=0).astype(int)
+    active_tickets += cnt_new if prospective_counts_as_active else 0
+    for e, n in active_tickets[active_tickets > 8].items():
+        reasons[e].append(f"Rule1: active tickets including new={n} > 8")
+    if early_exit:
+        o, codes, keys, n_keys = _drop_unavailable(o, reasons)
+        cnt = o["cnt"].to_numpy(dtype=np.int64)
 
     # Rule 2: no more than 12 tickets in any 6-month period (based on sold_date)
-    # Implementation: sliding window over sold_date-sorted rows.
-    # Assumption: missing sold_date -> treat as ingested_at if available, else today's date.
-    s = o.copy()
-    if s.empty:
-        sold_window_violation = False
-    else:
-        if "sold_date" not in s.columns or s["sold_date"].isna().all():
-            if "ingested_at" in s.columns and not s["ingested_at"].isna().all():
-                s["sold_date"] = s["ingested_at"].fillna(pd.Timestamp(today))
-            else:
-                s["sold_date"] = pd.Timestamp(today)
-
-        s = s.dropna(subset=["sold_date"]).sort_values("sold_date").reset_index(drop=True)
-        sold_window_violation = False
-        if not s.empty:
-            dates = s["sold_date"].tolist()
-            cnts = s["cnt"].astype(int).tolist()
-            # include prospective purchase in the lists (use sold_date_new or today)
-            sd_new = sold_date_new if sold_date_new is not None else pd.Timestamp(today)
-            dates.append(sd_new)
-            cnts.append(int(cnt_new))
-            # two-pointer sliding window
-            j = 0
-            import pandas as _pd
-            for i in range(len(dates)):
-                start = dates[i]
-                end = start + _pd.DateOffset(months=6)
-                # move j forward while dates[j] < end
-                total = 0
-                k = i
-                while k < len(dates) and dates[k] < end:
-                    total += cnts[k]
-                    k += 1
-                if total > 12:
-                    sold_window_violation = True
-                    break
-    if sold_window_violation:
-        reasons.append("Rule2: >12 tickets within a 6-month window")
-
-    # Rule 3: No multiple purchases for same event+theater on different event dates
-    # For each (event, theater) group, check number of distinct event_date values > 1
-    # Rule 3: No multiple purchases for same (event, theater) on different event dates.
-    # If prospective (event, theater, event_date) provided, include it in the group and check.
-    if not o.empty or (event and theater and event_date is not None):
-        # build a DataFrame representing existing + prospective rows for grouping
-        grp_df = o[["event", "theater", "event_date"]].copy()
-        if event and theater and event_date is not None:
-            grp_df = pd.concat([
-                grp_df,
-                pd.DataFrame({"event": [event], "theater": [theater], "event_date": [event_date]})
-            ], ignore_index=True)
-
-        grp = grp_df.groupby(["event", "theater"], dropna=False)
-        for (ev, th), g in grp:
-            if pd.isna(ev) or str(ev).strip() == "" or pd.isna(th) or str(th).strip() == "":
-                continue
-            unique_dates = g["event_date"].dropna().dt.normalize().unique()
-            if len(unique_dates) > 1:
-                reasons.append(f"Rule3: multiple event dates for event='{ev}' theater='{th}'")
-                break
+    # Implementation: sliding window over sold_date-sorted rows, per email.
+    # Assumption: an email with no sold_date at all uses ingested_at where
+    # available, else today's date.
+    sold = _naive(o["sold_date"])
+    no_sold = (np.bincount(codes, weights=sold.notna().to_numpy(), minlength=n_keys) == 0)[codes]
+    if no_sold.any():
+        ingested = _naive(o["ingested_at"])
+        has_ingested = (np.bincount(codes, weights=ingested.notna().to_numpy(), minlength=n_keys) > 0)[codes]
+        fallback = ingested.fillna(today_naive).where(has_ingested, today_naive)
+        sold = sold.where(~no_sold, fallback)
+    sold_ns = sold.to_numpy(dtype="datetime64[ns]")
+    rows = np.flatnonzero(~np.isnat(sold_ns))
+    sold_ns = sold_ns.view("i8")
+    # rows sorted by (email code, sold_date), then cut into one run per email;
+    # frames from load_orders_from_db usually arrive in that order already
+    step_code = np.diff(codes[rows])
+    if not np.all((step_code > 0) | ((step_code == 0) & (np.diff(sold_ns[rows]) >= 0))):
+        rows = rows[np.lexsort((sold_ns[rows], codes[rows]))]
+    cuts = np.flatnonzero(np.diff(codes[rows])) + 1
+    runs = np.split(rows, cuts) if len(rows) else []
+    # window end edges (calendar months) for every sorted row in one vectorized add
+    ends_sorted = (pd.DatetimeIndex(sold_ns[rows].view("datetime64[ns]")) + pd.DateOffset(months=6)).asi8
+    run_ends = np.split(ends_sorted, cuts) if len(rows) else []
+    # include prospective purchase in each email's window (use sold_date_new or today)
+    sd_new = _naive_ts(sold_date_new) if sold_date_new is not None else today_naive
+    sd_new_ns = np.int64(sd_new.value)
+    sd_new_end_ns = np.int64((sd_new + pd.DateOffset(months=6)).value)
+    for run, ends in zip(runs, run_ends):
+        dates = sold_ns[run]
+        pos = np.searchsorted(dates, sd_new_ns, side="right")
+        dates = np.insert(dates, pos, sd_new_ns)
+        ends = np.insert(ends, pos, sd_new_end_ns)
+        cnts = np.insert(cnt[run], pos, int(cnt_new))
+        if _rule2_violates(dates, ends, cnts, 12):
+            reasons[keys[codes[run[0]]]].append("Rule2: >12 tickets within a 6-month window")
+
+    if early_exit:
+        o, codes, keys, n_keys = _drop_unavailable(o, reasons)
+        event_dates = _naive(o["event_date"])
 
-    available = len(reasons) == 0
-    return available, reasons
+    # Rule 3: No multiple purchases for same (event, theater) on different event dates.
+    # Count distinct event dates per (email, event, theater) over existing rows;
+    # the prospective (event, theater, event_date), if provided, joins every
+    # email's matching group without materializing one extra row per email.
+    grp_df = pd.DataFrame({"code": codes, "event": o["event"].to_numpy(), "theater": o["theater"].to_numpy(), "day": event_dates.dt.normalize().to_numpy()})
+    keyed = (
+        grp_df["event"].astype("string").str.strip().fillna("").ne("")
+        & grp_df["theater"].astype("string").str.strip().fillna("").ne("")
+    )
+    by_group = grp_df[keyed].groupby(["code", "event", "theater"])["day"]
+    n_dates = by_group.nunique()
+    if event and theater and event_date is not None and str(event).strip() and str(theater).strip():
+        new_day = _naive_ts(event_date).normalize()
+        same_key = (n_dates.index.get_level_values("event") == event) & (n_dates.index.get_level_values("theater") == theater)
+        # a group with one existing date gains a second one unless it is new_day
+        first_day = by_group.min()
+        n_dates = n_dates + (same_key & first_day.notna().to_numpy() & first_day.ne(new_day).to_numpy())
+    # sorted by (email, event, theater): report the first conflicting group per email
+    conflicts = n_dates[n_dates.gt(1)].index.to_frame(index=False).drop_duplicates("code")
+    for code, ev_name, th in conflicts.itertuples(index=False):
+        reasons[keys[code]].append(f"Rule3: multiple event dates for event='{ev_name}' theater='{th}'")
+
+    return {e: (len(r) == 0, r) for e, r in reasons.items()}
+
+
+def _check_shard(args) -> Dict[str, Tuple[bool, List[str]]]:
+    emails, orders, today, prospective = args
+    return check_emails_availability(emails, orders, today, **prospective)
+
+
+def check_emails_availability_parallel(
+    emails: Iterable[str],
+    orders: pd.DataFrame,
+    today: pd.Timestamp,
+    workers: Optional[int] = None,
+    **prospective,
+) -> Dict[str, Tuple[bool, List[str]]]:
+    """check_emails_availability sharded by email across worker processes.
+
+    Each worker receives only its shard's rows of `orders`, so the frame is
+    never pickled whole. With `workers` <= 1 (or fewer than two shards' worth
+    of emails) this runs in-process.
+    """
+    emails = list(dict.fromkeys(emails))
+    workers = min(workers or os.cpu_count() or 1, max(len(emails) // MIN_SHARD, 1))
+    if workers <= 1:
+        return check_emails_availability(emails, orders, today, **prospective)
+    shards = [emails[i::workers] for i in range(workers)]
+    email_col = orders["email"]
+    tasks = [(shard, orders[email_col.isin(set(shard))], today, prospective) for shard in shards]
+    results: Dict[str, Tuple[bool, List[str]]] = {}
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for part in ex.map(_check_shard, tasks):
+            results.update(part)
+    return {e: results[e] for e in emails}
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -227,6 +453,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--doc-id", help="Google Sheets DOC_ID (defaults to .env GOOGLE_SHEETS_DOC_ID)")
     p.add_argument("--accounts-tab", default="Accounts", help="Accounts tab name")
     p.add_argument("--accounts-csv", help="Path to CSV with emails (column named 'email' or first column)")
+    p.add_argument("--no-accounts-cache", action="store_true", help="Always re-fetch the Accounts tab instead of using the revision-keyed cache")
     p.add_argument("--db-url", help="DB URL (sqlalchemy), defaults to .env/DB_URL or data.db")
     # prospective purchase flags
     p.add_argument("--event", help="Prospective Event name (string)")
@@ -234,6 +461,8 @@ def main(argv: Optional[List[str]] = None) -> int:
     p.add_argument("--event-date", help="Prospective Event Date (YYYY-MM-DD)")
     p.add_argument("--cnt", type=int, default=1, help="Prospective ticket count (default 1)")
     p.add_argument("--sold-date", help="Prospective Sold Date (YYYY-MM-DD)")
+    p.add_argument("--early-exit", action="store_true", help="Report only the first failing rule per email (skips the costlier rules)")
+    p.add_argument("--workers", type=int, default=1, help="Worker processes for the rule checks (0 = one per CPU)")
     args = p.parse_args(argv)
 
     today = pd.Timestamp.utcnow()
@@ -250,10 +479,20 @@ def main(argv: Optional[List[str]] = None) -> int:
         else:
             emails = df_acc.iloc[:, 0].astype("string").dropna().str.strip().str.lower().drop_duplicates().reset_index(drop=True)
     else:
-        emails = load_accounts_from_sheet(args.doc_id, args.accounts_tab)
+        emails = load_accounts_from_sheet(args.doc_id, args.accounts_tab, use_cache=not args.no_accounts_cache)
 
     engine = get_engine(args.db_url)
-    orders = load_orders_from_db(engine)
+    # the sheet may list an account more than once; report each once
+    emails = list(dict.fromkeys(emails))
+    try:
+        known = known_emails(engine, emails)
+    except Exception:
+        # e.g. sheet_facts missing: evaluate every email against whatever loads
+        known = set(emails)
+    # only accounts with history need their orders read and walked
+    with_history = [e for e in emails if e in known]
+    no_history = [e for e in emails if e not in known]
+    orders = load_orders_from_db(engine, emails=with_history)
 
     # parse prospective inputs
     event = args.event
@@ -265,21 +504,15 @@ def main(argv: Optional[List[str]] = None) -> int:
     available = []
     unavailable = {}
 
+    prospective = dict(event=event, theater=theater, event_date=event_date, cnt_new=cnt_new, sold_date_new=sold_date, early_exit=args.early_exit)
+    try:
+        results = check_emails_availability_parallel(with_history, orders, today, workers=args.workers, **prospective)
+        # no rows: only the prospective purchase alone can break Rule 1/2
+        results.update(check_emails_availability(no_history, orders.iloc[:0], today, **prospective))
+    except Exception as ex:
+        results = {e: (False, [f"error evaluating: {ex}"]) for e in emails}
     for e in emails:
-        try:
-            ok, reasons = check_email_availability(
-                e,
-                orders,
-                today,
-                event=event,
-                theater=theater,
-                event_date=event_date,
-                cnt_new=cnt_new,
-                sold_date_new=sold_date,
-            )
-        except Exception as ex:
-            ok = False
-            reasons = [f"error evaluating: {ex}"]
+        ok, reasons = results[e]
         if ok:
             available.append(e)
         else:
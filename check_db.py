@@ -1,25 +1,27 @@
-from db import get_engine
-from sqlalchemy import inspect
-import pathlib, sys
+import pathlib
+import sqlite3
 
-engine = get_engine()
-try:
-    # show engine URL / file path
-    url = getattr(engine, "url", None)
-    print("engine.url:", url)
-except Exception as e:
-    print("Failed to read engine.url:", e)
-insp = inspect(engine)
-print("Tables in DB:", insp.get_table_names())
-if "sheet_facts" in insp.get_table_names():
-    cols = [c["name"] for c in insp.get_columns("sheet_facts")]
-    print("sheet_facts columns:", cols)
-else:
-    print("sheet_facts not found")
-# show physical file for sqlite (if available)
-try:
-    file_path = str(engine.url.database)
+# same file db.get_engine() opens by default (db.DEFAULT_DB_URL); plain sqlite3
+# keeps this probe free of SQLAlchemy startup and reflection
+file_path = pathlib.Path(__file__).resolve().parent / "data.db"
+print("engine.url:", f"sqlite:///{file_path}")
+if not file_path.exists():
     print("SQLite file:", file_path)
-    print("Exists on disk:", pathlib.Path(file_path).exists())
-except Exception:
-    pass
\ No newline at end of file
+    print("Exists on disk:", False)
+    raise SystemExit(1)
+
+# read-only: a status probe should never create or modify the DB
+con = sqlite3.connect(f"{file_path.as_uri()}?mode=ro", uri=True)
+try:
+    tables = [r[0] for r in con.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")]
+    print("Tables in DB:", tables)
+    if "sheet_facts" in tables:
+        cols = [r[1] for r in con.execute("PRAGMA table_info(sheet_facts)")]
+        print("sheet_facts columns:", cols)
+    else:
+        print("sheet_facts not found")
+finally:
+    con.close()
+# show physical file for sqlite
+print("SQLite file:", file_path)
+print("Exists on disk:", file_path.exists())
\ No newline at end of file
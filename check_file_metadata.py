@@ -1,14 +1,10 @@
 import os
 from dotenv import load_dotenv
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+
+from diag_common import get_drive
 
 load_dotenv()
-creds = Credentials.from_service_account_file(
-    os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "service_account.json"),
-    scopes=["https://www.googleapis.com/auth/drive.metadata.readonly"]
-)
-drive = build("drive", "v3", credentials=creds, cache_discovery=False)
+drive = get_drive(os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "service_account.json"))
 file_id = os.getenv("GOOGLE_SHEETS_DOC_ID")
 meta = drive.files().get(fileId=file_id, fields="id,name,mimeType,owners,shared,permissions").execute()
 print("File metadata:", meta)
\ No newline at end of file
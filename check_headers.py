@@ -1,11 +1,11 @@
 import os
 from dotenv import load_dotenv
 from difflib import get_close_matches
-from google.oauth2.service_account import Credentials
-import gspread
 from sqlalchemy import create_engine, inspect
 from pathlib import Path
 
+from diag_common import get_ws
+
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
 
@@ -30,14 +30,7 @@ print("DB_URL:", DB_URL)
 print()
 
 # Fetch header row from Google Sheets
-creds = Credentials.from_service_account_file(
-    SA_FILE,
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly"]
-)
-gc = gspread.authorize(creds)
-sh = gc.open_by_key(DOC_ID)
-ws = sh.worksheet(TAB)
+ws = get_ws(SA_FILE, DOC_ID, TAB)
 headers = ws.row_values(HEADER_ROW)
 print("Headers found on row", HEADER_ROW, ":")
 for i, h in enumerate(headers, start=1):
@@ -1,10 +1,10 @@
 from dotenv import load_dotenv
-from google.oauth2.service_account import Credentials
-import gspread
 from pathlib import Path
 import os
 from collections import Counter
 
+from diag_common import get_ws
+
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
 
@@ -19,14 +19,7 @@ print("HEADER_ROW:", HEADER_ROW)
 print("SA_FILE:", SA_FILE)
 print()
 
-creds = Credentials.from_service_account_file(
-    SA_FILE,
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly",
-            "https://www.googleapis.com/auth/drive.readonly"]
-)
-gc = gspread.authorize(creds)
-sh = gc.open_by_key(DOC_ID)
-ws = sh.worksheet(TAB)
+ws = get_ws(SA_FILE, DOC_ID, TAB)
 
 all_rows = ws.get_all_values()
 print("Total rows fetched from sheet:", len(all_rows))
@@ -1,7 +1,9 @@
+import os
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from sqlalchemy import (
     create_engine,
+    event,
     MetaData,
     Table,
     Column,
@@ -9,6 +11,7 @@ from sqlalchemy import (
     Text,
     Float,
     DateTime,
+    Index,
     insert,
     select,
 )
@@ -22,6 +25,32 @@ from datetime import datetime
 
 BASE_DIR = Path(__file__).resolve().parent
 DEFAULT_DB_URL = f"sqlite:///{BASE_DIR / 'data.db'}"
+# Columnar read-side copy of sheet_facts: one Parquet file per ingest run
+# (ingest.main), merged into one once there are more than
+# PARQUET_MAX_PARTITIONS. SQLite stays the source of truth.
+PARQUET_DIR = Path(os.getenv("PARQUET_DIR", BASE_DIR / "data" / "ingest"))
+PARQUET_MAX_PARTITIONS = int(os.getenv("PARQUET_MAX_PARTITIONS", "20"))
+
+# Applied to every new SQLite connection (see get_engine). WAL + NORMAL sync
+# avoids an fsync per commit; cache/mmap keep hot pages out of syscalls.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-131072",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA wal_autocheckpoint=1000",
+)
+
+# SQL spelling of the email key used by the availability checks (strip + lower)
+EMAIL_KEY_SQL = "lower(trim(email, char(32, 9, 10, 11, 12, 13)))"
+
+# Expression indexes serving load_orders_from_db: WHERE <email key> IN (...)
+# ORDER BY <email key>, sold_date (Rule 2) and the (event, theater) grouping (Rule 3).
+SQLITE_EXTRA_INDEXES = (
+    f"CREATE INDEX IF NOT EXISTS ix_sheet_facts_email_sold ON sheet_facts({EMAIL_KEY_SQL}, sold_date)",
+    f"CREATE INDEX IF NOT EXISTS ix_sheet_facts_email_ev_th ON sheet_facts({EMAIL_KEY_SQL}, event, theater)",
+)
 
 metadata = MetaData()
 
@@ -53,6 +82,7 @@ sheet_facts = Table(
     Column("venue", Text),
     Column("notes", Text),
     Column("ingested_at", DateTime, server_default=func.current_timestamp()),
+    Index("ix_sheet_facts_sold_date", "sold_date"),
 )
 
 
@@ -61,14 +91,39 @@ def get_engine(db_url: str | None = None) -> Engine:
     Create and return an SQLAlchemy Engine. Do NOT run any DB operations at import time.
     """
     url = db_url or DEFAULT_DB_URL
-    return create_engine(url, future=True)
+    if not url.startswith("sqlite"):
+        return create_engine(url, future=True)
+
+    engine = create_engine(url, future=True, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _record):
+        cur = dbapi_conn.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cur.execute(pragma)
+        finally:
+            cur.close()
+
+    return engine
 
 
 def init_db(engine: Engine) -> None:
     """
-    Create required tables if they don't exist.
+    Create required tables and indexes if they don't exist.
     """
     metadata.create_all(engine)
+    # create_all skips indexes on tables that already exist, so add any new ones
+    for index in sheet_facts.indexes:
+        index.create(engine, checkfirst=True)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            for ddl in SQLITE_EXTRA_INDEXES:
+                conn.exec_driver_sql(ddl)
+
+
+# value types the DB driver binds without conversion
+_DRIVER_NATIVE = frozenset({str, int, float, bool, bytes, datetime})
 
 
 def upsert_rows(engine: Engine, rows: List[Dict[str, Any]]) -> int:
@@ -126,10 +181,119 @@ def upsert_rows(engine: Engine, rows: List[Dict[str, Any]]) -> int:
                 return v
         return v
 
-    with engine.begin() as conn:
-        for r in rows:
-            # order params to match cols list; None for missing keys
-            params = tuple(_clean_value(r.get(c)) for c in cols)
-            conn.exec_driver_sql(sql, params)
+    def _pick_converter(types):
+        # one converter per object column, chosen from the value types present
+        if all(t in _DRIVER_NATIVE for t in types):
+            return None  # sqlite3 binds these as they are
+        if len(types) == 1:
+            (t,) = types
+            if issubclass(t, pd.Timestamp):
+                return lambda v: v.to_pydatetime()
+            if issubclass(t, np.generic) and not issubclass(t, np.datetime64):
+                return lambda v: v.item()
+        # mixed Python/numpy values still need the generic per-value conversion
+        return _clean_value
 
+    # convert column-wise: order params to match cols list; None for missing keys.
+    # Columns are object arrays built straight from the row dicts, with no
+    # dtype inference: an int column holding None must not turn into float64.
+    columns = []
+    for c in cols:
+        values = np.empty(len(rows), dtype=object)
+        values[:] = [r.get(c) for r in rows]
+        missing = pd.isna(values)
+        present = values[~missing]
+        convert = _pick_converter(set(map(type, present)))
+        if convert is not None:
+            values[~missing] = [convert(v) for v in present]
+        values[missing] = None
+        columns.append(values)
+    params = list(zip(*columns))
+    with engine.begin() as conn:
+        # one prepared statement, executemany over all rows in one transaction
+        conn.exec_driver_sql(sql, params)
     return len(rows)
+
+
+def write_parquet_partition(rows, out_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Write rows (list of dicts or a DataFrame) as a new Parquet partition named
+    by ingest timestamp. Failures are logged, not raised: the Parquet files are
+    only a read cache.
+    """
+    if len(rows) == 0:
+        return None
+    out_dir = Path(out_dir or PARQUET_DIR)
+    path = out_dir / f"{datetime.utcnow():%Y%m%dT%H%M%S%f}.parquet"
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(rows).to_parquet(path, engine="pyarrow", index=False)
+    except Exception as e:
+        logging.warning("Could not write Parquet partition %s: %s", path, e)
+        return None
+    return path
+
+
+def compact_parquet_partitions(out_dir: Optional[Path] = None, max_partitions: Optional[int] = None) -> Optional[Path]:
+    """
+    Merge the partitions into one file once there are more than
+    `max_partitions` (default PARQUET_MAX_PARTITIONS), keeping the latest copy
+    of each row_hash. The merged file takes the newest partition's name, so
+    later partitions still sort after it. Failures are logged, not raised.
+    """
+    limit = PARQUET_MAX_PARTITIONS if max_partitions is None else max_partitions
+    paths = sorted(Path(out_dir or PARQUET_DIR).glob("*.parquet"))
+    if len(paths) <= max(limit, 1):
+        return None
+    newest = paths[-1]
+    tmp = newest.with_suffix(".compacting")
+    try:
+        df = pd.concat([pd.read_parquet(p, engine="pyarrow") for p in paths], ignore_index=True)
+        if "row_hash" in df.columns:
+            df = df.drop_duplicates(subset="row_hash", keep="last")
+        df.to_parquet(tmp, engine="pyarrow", index=False)
+        # swap the merged file in first: readers never see the rows missing
+        tmp.replace(newest)
+        for p in paths[:-1]:
+            p.unlink(missing_ok=True)
+    except Exception as e:
+        logging.warning("Could not compact Parquet partitions in %s: %s", newest.parent, e)
+        tmp.unlink(missing_ok=True)
+        return None
+    return newest
+
+
+def read_parquet_partitions(columns: List[str], out_dir: Optional[Path] = None, last_n: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """
+    Read `columns` from the Parquet partitions (optionally only the newest
+    `last_n`), keeping the latest copy of each row_hash. Returns None when
+    there are no partitions.
+    """
+    import pyarrow.parquet as pq
+
+    paths = sorted(Path(out_dir or PARQUET_DIR).glob("*.parquet"))
+    if last_n:
+        paths = paths[-last_n:]
+    if not paths:
+        return None
+    want = list(dict.fromkeys(["row_hash", *columns]))
+    frames = []
+    for p in paths:
+        present = set(pq.read_schema(p).names)
+        frames.append(pd.read_parquet(p, engine="pyarrow", columns=[c for c in want if c in present]))
+    df = pd.concat(frames, ignore_index=True)
+    if "row_hash" in df.columns:
+        df = df.drop_duplicates(subset="row_hash", keep="last")
+    return df.reindex(columns=columns).reset_index(drop=True)
+
+
+def export_parquet_snapshot(engine: Engine, out_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Backfill: write the whole sheet_facts table as one partition so Parquet
+    reads cover rows ingested before partitions were written.
+    """
+    df = pd.read_sql("SELECT * FROM sheet_facts", engine)
+    for col in sheet_facts.columns:
+        if isinstance(col.type, DateTime) and col.name in df.columns:
+            df[col.name] = pd.to_datetime(df[col.name], errors="coerce")
+    return write_parquet_partition(df, out_dir)
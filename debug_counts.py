@@ -1,62 +1,64 @@
+import argparse
 import os
+import sqlite3
 from pathlib import Path
 from dotenv import load_dotenv
-import pandas as pd
-from sqlalchemy import create_engine, text
 
 BASE_DIR = Path(__file__).resolve().parent
 load_dotenv(BASE_DIR / ".env")
 
 DB_URL = os.getenv("DB_URL", f"sqlite:///{BASE_DIR / 'data.db'}")
+
+parser = argparse.ArgumentParser(description="Row counts and a small sample from sheet_facts")
+parser.add_argument("--deep", action="store_true", help="also load the whole table and run the app's dtype coercion")
+args = parser.parse_args()
 print("DB_URL:", DB_URL)
 
-engine = create_engine(DB_URL, future=True)
+# the counts and sample go through plain sqlite3 (as in check_db.py): no
+# SQLAlchemy or pandas startup for a probe that reads a handful of rows
+if not DB_URL.startswith("sqlite:///"):
+    raise SystemExit("debug_counts.py probes SQLite files only (DB_URL must start with sqlite:///)")
+file_path = Path(DB_URL[len("sqlite:///"):]).resolve()
+if not file_path.exists():
+    raise SystemExit(f"SQLite file not found: {file_path}")
 
-with engine.begin() as conn:
+# read-only: a debug probe should never create or modify the DB
+con = sqlite3.connect(f"{file_path.as_uri()}?mode=ro", uri=True)
+try:
     # raw SQL count
-    total = conn.execute(text("SELECT COUNT(*) FROM sheet_facts")).scalar()
-    distinct_ids = conn.execute(text("SELECT COUNT(DISTINCT id) FROM sheet_facts")).scalar()
+    total, distinct_ids = con.execute("SELECT COUNT(*), COUNT(DISTINCT id) FROM sheet_facts").fetchone()
     print("SQL COUNT(*) =", total)
     print("SQL COUNT(DISTINCT id) =", distinct_ids)
 
-# read all rows with pandas (no ORDER/LIMIT)
-df_all = pd.read_sql("SELECT * FROM sheet_facts", engine)
-print("pandas read_sql rows:", len(df_all))
-
-# show id stats and nulls
-if "id" in df_all.columns:
-    print("id min/max:", df_all["id"].min(), df_all["id"].max())
-    print("id nulls:", df_all["id"].isna().sum())
-
-# show how many rows survive your app's load_data transformations
-from app import SCHEMA_MAP  # reuse mapping
-df = df_all.copy()
-
-# rename like app
-rename_map = {src: dst for src, (dst, _) in SCHEMA_MAP.items() if src in df.columns}
-if rename_map:
-    df = df.rename(columns=rename_map)
-
-# coerce similar to app (best-effort)
-for src, (dst, dtype) in SCHEMA_MAP.items():
-    if dst in df.columns:
-        try:
-            if dtype == "datetime64[ns]":
-                df[dst] = pd.to_datetime(df[dst], errors="coerce")
-            else:
-                df[dst] = df[dst].astype(dtype)
-        except Exception:
-            if dtype in ("float", "Int64"):
-                df[dst] = pd.to_numeric(df.get(dst), errors="coerce")
-                if dtype == "Int64":
-                    df[dst] = df[dst].astype("Int64")
-            else:
-                df[dst] = df[dst].astype("string")
-
-print("rows after app-like coercion:", len(df))
-
-# show sample rows that might be problematic (e.g., many NaNs)
-print("\nTop 5 rows:")
-print(df_all.head().to_string(index=False))
-print("\nRows with any all-null values in important columns:")
-print(df[[c for _, (c, _) in SCHEMA_MAP.items() if c in df.columns]].isna().all(axis=1).sum())
\ No newline at end of file
+    # id stats straight from SQL instead of loading the table
+    id_min, id_max, id_nulls = con.execute(
+        "SELECT MIN(id), MAX(id), SUM(CASE WHEN id IS NULL THEN 1 ELSE 0 END) FROM sheet_facts"
+    ).fetchone()
+    print("id min/max:", id_min, id_max)
+    print("id nulls:", id_nulls or 0)
+
+    # show sample rows that might be problematic (e.g., many NaNs)
+    cur = con.execute("SELECT * FROM sheet_facts LIMIT 5")
+    print("\nTop 5 rows:")
+    print(" | ".join(d[0] for d in cur.description))
+    for row in cur.fetchall():
+        print(" | ".join("" if v is None else str(v) for v in row))
+finally:
+    con.close()
+
+if args.deep:
+    import pandas as pd
+    from sqlalchemy import create_engine
+
+    # read all rows with pandas (no ORDER/LIMIT)
+    engine = create_engine(DB_URL, future=True)
+    df_all = pd.read_sql("SELECT * FROM sheet_facts", engine)
+    print("\npandas read_sql rows:", len(df_all))
+
+    # show how many rows survive your app's load_data transformations
+    from schema import SCHEMA_MAP, coerce_df  # reuse mapping
+    df = coerce_df(df_all.copy(), SCHEMA_MAP)
+
+    print("rows after app-like coercion:", len(df))
+    print("\nRows with any all-null values in important columns:")
+    print(df[[c for _, (c, _) in SCHEMA_MAP.items() if c in df.columns]].isna().all(axis=1).sum())
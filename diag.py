@@ -39,15 +39,8 @@ for pkg in ["gspread", "google.oauth2.service_account", "pandas", "sqlalchemy"]:
 try:
     if not (doc_id and tab and creds):
         raise RuntimeError("Skip sheet test: missing env")
-    import gspread
-    from google.oauth2.service_account import Credentials
-    SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
-    cobj = Credentials.from_service_account_file(
-        str((PROJECT_DIR / creds) if not os.path.isabs(creds) else creds),
-        scopes=SCOPES
-    )
-    gc = gspread.authorize(cobj)
-    ws = gc.open_by_key(doc_id).worksheet(tab)
+    from diag_common import get_ws
+    ws = get_ws(creds, doc_id, tab)
     data = ws.get_all_values()
     print("Sheet reachable. Header:", (data[0] if data else None), "| rows(excl header):", max(len(data)-1, 0))
 except Exception as e:
@@ -0,0 +1,54 @@
+# diag_common.py
+"""
+Shared Google auth for the diagnostic scripts (check_headers.py,
+check_parsed_rows.py, check_file_metadata.py, diag.py).
+
+Credentials, the gspread client and opened worksheets are cached per process,
+so running several checks back to back authorizes and opens the sheet once.
+"""
+import os
+from functools import lru_cache
+from pathlib import Path
+
+import gspread
+from google.oauth2.service_account import Credentials
+
+import auth
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# one scope set for both Sheets and Drive so a single creds object serves both
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets.readonly",
+    "https://www.googleapis.com/auth/drive.readonly",
+]
+
+
+def _resolve(sa_file: str) -> str:
+    """Resolve a relative service-account path against the project folder."""
+    return sa_file if os.path.isabs(sa_file) else str((BASE_DIR / sa_file).resolve())
+
+
+@lru_cache(maxsize=None)
+def get_creds(sa_file: str) -> Credentials:
+    return Credentials.from_service_account_file(_resolve(sa_file), scopes=SCOPES)
+
+
+@lru_cache(maxsize=None)
+def get_client(sa_file: str) -> gspread.Client:
+    return gspread.authorize(get_creds(sa_file))
+
+
+@lru_cache(maxsize=None)
+def get_spreadsheet(sa_file: str, doc_id: str) -> gspread.Spreadsheet:
+    return get_client(sa_file).open_by_key(doc_id)
+
+
+@lru_cache(maxsize=None)
+def get_ws(sa_file: str, doc_id: str, tab: str) -> gspread.Worksheet:
+    return get_spreadsheet(sa_file, doc_id).worksheet(tab)
+
+
+def get_drive(sa_file: str):
+    """Drive v3 service built on the same credentials as the Sheets client."""
+    return auth.get_drive(get_creds(sa_file))
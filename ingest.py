@@ -2,16 +2,22 @@
 import os
 import sys
 import re
+import difflib
 import logging
 from pathlib import Path
 from datetime import datetime, timezone
-import difflib
 import json
+from dataclasses import dataclass
+from functools import lru_cache
 import inspect
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # replace the previous single import with a guarded import and fallbacks
-from db import get_engine, init_db, upsert_rows
+import sheet_cache
+from auth import get_client, sheet_revision
+from db import get_engine, init_db, upsert_rows, write_parquet_partition, compact_parquet_partitions
 try:
     from db import with_row_hash, normalize_df
 except Exception:
@@ -25,6 +31,11 @@ import os
 from dotenv import load_dotenv
 import numpy as np
 
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; only needed for ROW_HASH_ALGO=xxh3_128
+    xxhash = None
+
 # add this so BASE_DIR is available for DB_URL and relative paths
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -41,6 +52,22 @@ DOC_ID = os.getenv("GOOGLE_SHEETS_DOC_ID")
 TAB = os.getenv("GOOGLE_SHEETS_TAB", "Orders")
 CREDS_FILE = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", "service_account.json")
 DB_URL = os.getenv("DB_URL", f"sqlite:///{BASE_DIR / 'data.db'}")
+# set WRITE_SCHEMA_SUGGESTION=0 to skip the review files written on every run
+WRITE_SCHEMA_SUGGESTION = os.getenv("WRITE_SCHEMA_SUGGESTION", "1").strip() != "0"
+# row_hash is the upsert conflict key, so changing the algorithm re-keys every
+# row: pick one per database. sha1 is the default all existing rows use
+ROW_HASH_ALGO = os.getenv("ROW_HASH_ALGO", "sha1").strip().lower()
+_ROW_HASHERS = {
+    "sha1": lambda b: hashlib.sha1(b).hexdigest(),
+    "blake2b": lambda b: hashlib.blake2b(b, digest_size=20).hexdigest(),
+}
+if xxhash is not None:
+    _ROW_HASHERS["xxh3_128"] = xxhash.xxh3_128_hexdigest
+if ROW_HASH_ALGO not in _ROW_HASHERS:
+    raise ValueError(f"ROW_HASH_ALGO must be one of {sorted(_ROW_HASHERS)}, got {ROW_HASH_ALGO!r}")
+# reuse fetched sheet frames while the Drive revision is unchanged (sheet_cache);
+# set SHEET_CACHE=0 to always re-download
+SHEET_CACHE = os.getenv("SHEET_CACHE", "1").strip() != "0"
 
 # resolve relative creds file path
 if not os.path.isabs(CREDS_FILE):
@@ -82,50 +109,74 @@ DESIRED_SCHEMA = {
 
 FUZZY_CUTOFF = 0.6  # 0.0-1.0, increase to require closer matches
 
+@lru_cache(maxsize=1024)
+def _close_match(alt: str, actual: tuple):
+    """Best fuzzy match for `alt` among `actual` headers above FUZZY_CUTOFF, or None.
+
+    difflib is the only scorer, so the schema map for a sheet does not depend
+    on which optional packages are installed; the result is memoized per
+    header layout, so its cost is paid once.
+    """
+    candidates = difflib.get_close_matches(alt, actual, n=1, cutoff=FUZZY_CUTOFF)
+    return candidates[0] if candidates else None
+
+
 def build_schema_map(actual_headers):
     """
     Build SCHEMA_MAP: maps actual sheet header -> (normalized_name, dtype)
-    Uses exact match against alternatives first, then difflib fuzzy matching.
+    Uses exact match against alternatives first, then fuzzy matching.
+    Results are memoized per header layout; callers get their own dict.
     """
-    actual = [str(h).strip() for h in actual_headers]
-    mapping = {}
-    used_actual = set()
-
-    for norm_name, (alternatives, dtype) in DESIRED_SCHEMA.items():
-        found = None
-        # exact match (case-sensitive and case-insensitive)
-        for alt in alternatives:
-            if alt in actual:
-                found = alt
-                break
-        if not found:
-            for alt in alternatives:
-                alt_lower = alt.lower()
-                for h in actual:
-                    if h.lower() == alt_lower:
-                        found = h
-                        break
-                if found:
-                    break
-        # fuzzy match fallback (try each alternative separately)
+    return dict(_build_schema_map_cached(tuple(str(h).strip() for h in actual_headers)))
+
+
+@lru_cache(maxsize=32)
+def _build_schema_map_cached(actual_headers: tuple):
+    actual = list(actual_headers)
+    # header lookups built once: exact set and lower-case -> first actual header
+    actual_set = set(actual)
+    lower_map = {}
+    for h in actual:
+        lower_map.setdefault(h.lower(), h)
+
+    # exact matches first (case-sensitive, then case-insensitive), so a fuzzy
+    # match for one field can never take a header another field names exactly
+    matches = {}
+    for norm_name, (alternatives, _) in DESIRED_SCHEMA.items():
+        found = next((alt for alt in alternatives if alt in actual_set), None)
         if not found:
-            for alt in alternatives:
-                candidates = difflib.get_close_matches(alt, actual, n=1, cutoff=FUZZY_CUTOFF)
-                if not candidates:
+            found = next((lower_map[alt.lower()] for alt in alternatives if alt.lower() in lower_map), None)
+        if found:
+            matches[norm_name] = found
+    used_actual = set(matches.values())
+
+    # fuzzy match fallback (try each alternative separately) against the
+    # headers no field has claimed yet, so a missing "Trans Date" cannot take
+    # over "Sold Date"
+    for norm_name, (alternatives, _) in DESIRED_SCHEMA.items():
+        if norm_name in matches:
+            continue
+        free = tuple(dict.fromkeys(h for h in actual if h not in used_actual))
+        for alt in alternatives:
+            candidate = _close_match(alt, free)
+            if candidate is None:
+                continue
+            # special-case: do not match a very short header like "Time"
+            # to a longer alternative like "Ingested At" / "Timestamp"
+            if alt.lower().find("ingest") >= 0 or alt.lower().find("timestamp") >= 0:
+                if candidate.strip().lower() == "time":
+                    # skip this fuzzy match (likely wrong)
                     continue
-                candidate = candidates[0]
-                # special-case: do not match a very short header like "Time"
-                # to a longer alternative like "Ingested At" / "Timestamp"
-                if alt.lower().find("ingest") >= 0 or alt.lower().find("timestamp") >= 0:
-                    if candidate.strip().lower() == "time":
-                        # skip this fuzzy match (likely wrong)
-                        continue
-                found = candidate
-                break
+            matches[norm_name] = candidate
+            used_actual.add(candidate)
+            break
 
-        if found:
-            mapping[found] = (norm_name, dtype)
-            used_actual.add(found)
+    # mapping in DESIRED_SCHEMA order: the prepared frame's column order (and
+    # with it row_hash) does not depend on which fields matched fuzzily
+    mapping = {}
+    for norm_name, (_, dtype) in DESIRED_SCHEMA.items():
+        if norm_name in matches:
+            mapping[matches[norm_name]] = (norm_name, dtype)
         else:
             # no header found for this normalized field; create mapping so we still create the column later
             mapping[f"__missing__:{norm_name}"] = (norm_name, dtype)
@@ -152,15 +203,33 @@ SCHEMA_MAP = {
     "Ingested At": ("ingested_at", "datetime64[ns]"),
 }
 
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+# threads for per-column coercion; pandas' string and parsing kernels release
+# the GIL, so columns convert in parallel on multi-core hosts
+COERCE_WORKERS = min(8, os.cpu_count() or 1)
+
+# rows per upsert_rows call in main()
+UPSERT_CHUNK = 5000
+
+# substrings that mark a header cell in fetch_sheet's header-row detection
+HEADER_KEYWORDS = frozenset({
+    "order", "sold", "event", "date", "revenue", "email", "confirm", "site",
+    "purch", "trans", "ticket", "venue", "section", "row", "cost", "profit",
+})
+# one alternation for all keywords: a single C-level search per cell
+_HEADER_KW_RE = re.compile("|".join(map(re.escape, sorted(HEADER_KEYWORDS))))
+# real headers sit near the top; detection never scans into the data body
+HEADER_SCAN_ROWS = 50
+
+
+# spreadsheet key inside a docs.google.com/.../d/<key>/... URL
+_SHEET_KEY_RE = re.compile(r"/d/([a-zA-Z0-9-_]+)")
 
 
 def _extract_sheet_key(raw: str) -> str:
     if not raw:
         return ""
     s = str(raw).strip()
-    m = re.search(r"/d/([a-zA-Z0-9-_]+)", s)
-    if m:
+    if m := _SHEET_KEY_RE.search(s):
         return m.group(1)
     return s.strip("/")
 
@@ -174,42 +243,65 @@ def fetch_sheet(doc_id: str, tab: str) -> pd.DataFrame:
       - fallback to first row if detection fails.
     """
     logging.debug(f"[DEBUG] DOC_ID: {doc_id}")
-    creds = Credentials.from_service_account_file(CREDS_FILE, scopes=SCOPES)
-    gc = gspread.authorize(creds)
+    # process-wide client with the pooled, retrying session (auth.get_client)
+    gc = get_client()
 
     key = _extract_sheet_key(str(doc_id or ""))
 
     try:
-        ws = gc.open_by_key(key).worksheet(tab)
+        sh = gc.open_by_key(key)
     except gspread.exceptions.SpreadsheetNotFound:
         if str(doc_id or "").lower().startswith("http") or "docs.google.com" in str(doc_id or "").lower():
-            ws = gc.open_by_url(str(doc_id)).worksheet(tab)
+            sh = gc.open_by_url(str(doc_id))
         else:
             raise RuntimeError("Spreadsheet not found. Confirm GOOGLE_SHEETS_DOC_ID and that the service account has Viewer access.")
     except gspread.exceptions.APIError as e:
         raise RuntimeError("Sheets API error: ensure the ID points to a Google Sheet and the service account is shared with it.") from e
 
-    data = ws.get_all_values()
-    if not data:
-        return pd.DataFrame()
+    # one values.batchGet for the whole tab instead of a worksheet metadata
+    # fetch plus a values read; the API already drops trailing empty rows and
+    # columns. Numbers arrive as JSON numbers instead of locale-formatted
+    # strings; dates and times keep their displayed text (serials would turn
+    # the text `time` column into day fractions). Text-typed schema columns
+    # get their displayed text back below (_restore_formatted_text)
+    resp = sh.values_batch_get(
+        [gspread.utils.absolute_range_name(tab)],
+        params={
+            "majorDimension": "ROWS",
+            "valueRenderOption": "UNFORMATTED_VALUE",
+            "dateTimeRenderOption": "FORMATTED_STRING",
+        },
+    )
+    values = resp["valueRanges"][0].get("values", [])
+    header_idx = None
+    # row of `values` that data[0] holds
+    offset = 0
+    # If env override present, use it: rows above the header are dropped before
+    # padding, so they cannot widen the frame
+    if HEADER_ROW_IDX is not None and 0 <= HEADER_ROW_IDX < len(values):
+        data = gspread.utils.fill_gaps(values[HEADER_ROW_IDX:])
+        header_idx = 0
+        offset = HEADER_ROW_IDX
+        logging.info("Using HEADER_ROW_IDX override: %d", HEADER_ROW_IDX)
+    if header_idx is None:
+        if not values:
+            return pd.DataFrame()
+        data = gspread.utils.fill_gaps(values)
 
-    # If env override present, use it
-    if HEADER_ROW_IDX is not None and 0 <= HEADER_ROW_IDX < len(data):
-        header_idx = HEADER_ROW_IDX
-        logging.info("Using HEADER_ROW_IDX override: %d", header_idx)
-    else:
         # existing heuristic detection...
-        expected_keywords = {
-            "order", "sold", "event", "date", "revenue", "email", "confirm", "site",
-            "purch", "trans", "ticket", "venue", "section", "row", "cost", "profit"
-        }
-
-        header_idx = None
-        for i, row in enumerate(data):
-            lower = [str(c).strip().lower() for c in row]
-            # count cells that contain any expected keyword
-            keyword_matches = sum(1 for cell in lower if any(k in cell for k in expected_keywords))
-            non_empty = sum(1 for cell in lower if cell)
+        for i, row in enumerate(data[:HEADER_SCAN_ROWS]):
+            # one pass over the cells: count non-empty cells and cells that
+            # contain any expected keyword, stopping as soon as the row qualifies
+            keyword_matches = non_empty = 0
+            for c in row:
+                cell = str(c).strip().lower()
+                if not cell:
+                    continue
+                non_empty += 1
+                if _HEADER_KW_RE.search(cell):
+                    keyword_matches += 1
+                if keyword_matches >= 2 or non_empty >= 6:
+                    break
             # choose row if it has multiple expected keywords OR many non-empty cells
             if keyword_matches >= 2 or non_empty >= 6:
                 header_idx = i
@@ -230,29 +322,206 @@ def fetch_sheet(doc_id: str, tab: str) -> pd.DataFrame:
     header = [str(h).strip() if h and str(h).strip() != "" else f"_col{j}" for j, h in enumerate(header_row)]
     rows = data[header_idx + 1 :]
 
+    # row-wise build: faster than transposing into per-column lists first on
+    # both pandas 2 and 3 (requirements allow either), with the same dtypes
     df = pd.DataFrame(rows, columns=header)
 
     # Normalize column names to stripped strings and make unique (preserve existing logic)
-    raw_cols = [str(c).strip() for c in df.columns]
-    seen = {}
-    cols = []
-    for c in raw_cols:
-        if c in seen:
-            seen[c] += 1
-            cols.append(f"{c}_{seen[c]}")
-        else:
-            seen[c] = 0
-            cols.append(c)
-    df.columns = cols
+    # repeats get _1, _2, ... from their running count within each name
+    names = pd.Series([str(c).strip() for c in df.columns], dtype=object)
+    seq = names.groupby(names, sort=False).cumcount()
+    suffixed = names + "_" + seq.astype(str).astype(object)
+    df.columns = names.where(seq == 0, suffixed).tolist()
+
+    # values[0] is the tab's row 1, so data rows start at sheet row offset + header_idx + 2
+    _restore_formatted_text(sh, tab, df, offset + header_idx + 2)
 
     logging.info("Final column names used: %s", df.columns.tolist())
     return df
 
 
-def enforce_schema_and_prepare(df: pd.DataFrame, schema_map: dict) -> pd.DataFrame:
+def _restore_formatted_text(sh, tab: str, df: pd.DataFrame, first_row: int) -> None:
     """
-    Now accepts schema_map (actual_header -> (normalized_name, dtype)).
+    Put the displayed text back into Text-typed schema columns (see
+    DESIRED_SCHEMA) that came back from the UNFORMATTED_VALUE read holding
+    numbers: a confirm ID shown as 0012 or 1,234 arrives as 12 / 1234, which
+    would change the stored value and row_hash. Only those columns are
+    re-read, with FORMATTED_VALUE, in one batchGet; tabs without such cells
+    cost no extra request. `first_row` is the 1-based sheet row of df's first row.
     """
+    if df.empty:
+        return
+    schema = build_schema_map(df.columns)
+    numeric_text = [
+        c for c in df.columns
+        if schema.get(c, (None, None))[1] == "string" and any(not isinstance(v, str) for v in df[c])
+    ]
+    if not numeric_text:
+        return
+
+    ranges = []
+    for c in numeric_text:
+        start = gspread.utils.rowcol_to_a1(first_row, df.columns.get_loc(c) + 1)
+        column = start.rstrip("0123456789")
+        ranges.append(gspread.utils.absolute_range_name(tab, f"{start}:{column}"))
+    resp = sh.values_batch_get(
+        ranges,
+        params={"majorDimension": "COLUMNS", "valueRenderOption": "FORMATTED_VALUE"},
+    )
+    for c, value_range in zip(numeric_text, resp["valueRanges"]):
+        # the API drops trailing empty cells; empty cells come back as ""
+        cells = (value_range.get("values") or [[]])[0][: len(df)]
+        df[c] = pd.Series(cells + [""] * (len(df) - len(cells)), index=df.index, dtype=object)
+    logging.info("Re-read displayed text for text columns holding numbers: %s", numeric_text)
+
+
+def fetch_sheet_cached(doc_id: str, tab: str, use_cache: bool = True) -> pd.DataFrame:
+    """
+    fetch_sheet, reusing the frame from the last run while the spreadsheet's
+    Drive revision is unchanged (see sheet_cache).
+    """
+    folder = None
+    if use_cache:
+        try:
+            key = _extract_sheet_key(str(doc_id or ""))
+            # the header override changes the frame, so it is part of the key
+            folder = sheet_cache.revision_dir(key, tab, f"{sheet_revision(key)}-h{HEADER_ROW_IDX}")
+            frames = sheet_cache.load_frames(folder)
+            if frames is not None:
+                logging.info("Sheet unchanged since last fetch; using %s", folder)
+                return frames[tab]
+        except Exception as e:
+            # no Drive access or unreadable cache: fetch the sheet uncached
+            logging.warning("Sheet cache unavailable: %s", e)
+            folder = None
+    df = fetch_sheet(doc_id, tab)
+    if folder is not None and df is not None:
+        try:
+            sheet_cache.save_frames(folder, {tab: df})
+        except Exception as e:
+            logging.warning("Could not write sheet cache %s: %s", folder, e)
+    return df
+
+
+def _to_int64(s: pd.Series) -> pd.Series:
+    num = pd.to_numeric(s, errors="coerce")
+    try:
+        return num.astype("Int64")
+    except (TypeError, ValueError):
+        return num  # fractional values stay float rather than being truncated
+
+
+def _coerce_other(dtype):
+    def coerce(s: pd.Series) -> pd.Series:
+        try:
+            return s.astype(dtype)
+        except Exception:
+            return s.astype("string")
+    return coerce
+
+
+# anything that is not part of a plain number: currency symbols, thousands
+# separators, parentheses, whitespace
+_CURRENCY_RE = re.compile(r"[^\d.\-]")
+
+# Sheets serial day numbers (days since 1899-12-30) inside date columns; the
+# bounds (1954..2119) keep years and yyyymmdd-style numbers out
+SERIAL_DAY_RANGE = (20000, 80000)
+
+
+def _to_datetime(s: pd.Series) -> pd.Series:
+    # pandas infers one format from the first non-null cell and parses the
+    # rest with it, so no format sniffing is needed here
+    parsed = pd.to_datetime(s, errors="coerce")
+    # date cells formatted as plain numbers arrive as serial days, which the
+    # string parser turns into NaT; convert those in one vectorized pass. In an
+    # all-text column only the cells the parser rejected can hold one
+    if pd.api.types.infer_dtype(s, skipna=True) == "string":
+        candidates = s[parsed.isna()]
+    else:
+        candidates = s
+    serial = pd.to_numeric(candidates, errors="coerce")
+    serial = serial.where(serial.between(*SERIAL_DAY_RANGE)).dropna()
+    if not serial.empty:
+        days = pd.to_datetime(serial.astype("float64"), unit="D", origin="1899-12-30")
+        parsed = parsed.copy()
+        parsed.loc[days.index] = days
+    return parsed
+
+
+# schema dtype -> column converter; numbers and dates go straight to the
+# coercing kernels instead of trying astype first
+_COERCERS = {
+    "datetime64[ns]": _to_datetime,
+    # plain float64 (NaN for missing), as astype("float") produced
+    "float": lambda s: pd.to_numeric(s, errors="coerce").astype("float64"),
+    "Int64": _to_int64,
+    "string": lambda s: s.astype("string"),
+}
+
+
+def _hash_text(s: pd.Series) -> list:
+    """str() of every cell as the row hash has always seen it, with None as ""."""
+    if s.dtype.kind == "M":
+        # str(Timestamp) per cell is the slow part of hashing; whole-second
+        # values format identically via numpy ("YYYY-MM-DD HH:MM:SS", "NaT")
+        values = s.to_numpy()
+        seconds = values.astype("datetime64[s]")
+        if (seconds == values)[~np.isnat(values)].all():
+            return [t if t == "NaT" else t.replace("T", " ") for t in np.datetime_as_string(seconds).tolist()]
+    values = s.to_numpy(dtype=object)
+    texts = list(map(str, values))
+    if s.dtype == object:
+        for i in np.flatnonzero(np.equal(values, None)):
+            texts[i] = ""
+    return texts
+
+
+# infer_dtype results for columns holding only numbers (and blanks)
+_NUMERIC_INFERRED = frozenset({"integer", "floating", "mixed-integer-float"})
+
+
+def _coerce_column(col: pd.Series, dtype: str) -> pd.Series:
+    """Coerce one column to its schema dtype; reads only `col`, so it is thread-safe."""
+    if dtype in ("float", "Int64"):
+        # UNFORMATTED_VALUE delivers numeric cells as numbers and blanks as "";
+        # such columns go straight to the numeric coercer without a string round trip
+        numbers = col.mask(col.eq("")) if col.dtype == object else col
+        kind = pd.api.types.infer_dtype(numbers, skipna=True)
+        # Int64 only takes whole numbers here; fractions keep the string path's rounding
+        if kind == "integer" or (dtype == "float" and kind in _NUMERIC_INFERRED):
+            return _COERCERS[dtype](numbers)
+        # clean currency/number strings so coercion works (strip $, commas, parentheses);
+        # empty strings become NA for numeric conversion
+        col = col.astype("string").fillna("").str.replace(_CURRENCY_RE, "", regex=True)
+        col = col.mask(col == "")
+    return _COERCERS.get(dtype, _coerce_other(dtype))(col)
+
+
+@dataclass(frozen=True)
+class SchemaPlan:
+    """A schema_map resolved once for enforce_schema_and_prepare."""
+
+    rename: dict  # actual sheet header -> normalized name (placeholders dropped)
+    dtypes: dict  # normalized name -> dtype, in first-seen order
+
+    @classmethod
+    def from_map(cls, schema_map: dict) -> "SchemaPlan":
+        rename = {}
+        dtypes = {}
+        for actual_header, (norm_name, dtype) in schema_map.items():
+            if not actual_header.startswith("__missing__"):
+                rename[actual_header] = norm_name
+            dtypes[norm_name] = dtype
+        return cls(rename=rename, dtypes=dtypes)
+
+
+def enforce_schema_and_prepare(df: pd.DataFrame, schema_map) -> pd.DataFrame:
+    """
+    Now accepts schema_map (actual_header -> (normalized_name, dtype)) or a
+    SchemaPlan built from one.
+    """
+    plan = schema_map if isinstance(schema_map, SchemaPlan) else SchemaPlan.from_map(schema_map)
     if df is None or df.empty:
         return pd.DataFrame()
 
@@ -260,62 +529,51 @@ def enforce_schema_and_prepare(df: pd.DataFrame, schema_map: dict) -> pd.DataFra
     try:
         df = normalize_df(df)
     except Exception:
-        df = df.applymap(lambda x: str(x).strip() if pd.notna(x) else x)
+        # vectorized trim of text columns; numeric columns are left alone, and
+        # so are columns headed for float/Int64, whose currency cleanup below
+        # drops whitespace anyway
+        present = set(df.columns)
+        numeric = {n for n, dtype in plan.dtypes.items() if dtype in ("float", "Int64")}
+        for c in df.select_dtypes(include=["object", "string"]).columns:
+            target = c if c in plan.dtypes else plan.rename.get(c)
+            if target in numeric and (target == c or target not in present):
+                continue
+            df[c] = df[c].astype("string").str.strip()
 
     # Build rename map from actual header -> normalized name
-    rename_map = {}
-    for actual_header, (norm_name, dtype) in schema_map.items():
-        if actual_header.startswith("__missing__"):
-            continue
-        if actual_header in df.columns and norm_name not in df.columns:
-            rename_map[actual_header] = norm_name
+    # one hashed column set instead of an Index scan per schema entry
+    present = set(df.columns)
+    rename_map = {a: n for a, n in plan.rename.items() if a in present and n not in present}
     if rename_map:
         df = df.rename(columns=rename_map)
 
-    # Ensure normalized names exist as columns (create missing as null)
-    for _, (norm_name, dtype) in schema_map.items():
-        # skip the placeholder keys
-        if norm_name not in df.columns:
-            df[norm_name] = pd.NA
-
-    # Ensure ingested_at exists and is a timestamp if missing
-    if "ingested_at" not in df.columns or df["ingested_at"].isna().all():
-        now = pd.Timestamp.utcnow().tz_localize(None)
+    # Ensure ingested_at is a timestamp if missing; an absent schema column is
+    # created in the pass below so columns keep their schema order
+    now = pd.Timestamp.utcnow().tz_localize(None)
+    present = set(df.columns)
+    if "ingested_at" in present and df["ingested_at"].isna().all():
         df["ingested_at"] = now
 
-    # Coerce types best-effort according to schema_map values (use norm_names)
-    # Build unique set of norm_name->dtype
-    norm_types = {}
-    for _, (norm_name, dtype) in schema_map.items():
-        norm_types[norm_name] = dtype
-
-    # --- ADDED: clean currency/number strings so coercion works (strip $, commas, parentheses) ---
-    import re
-    for dst, dtype in norm_types.items():
-        if dst in df.columns and dtype in ("float", "Int64"):
-            # convert to str, strip common currency characters, then coerce
-            df[dst] = df[dst].astype("string").fillna("").str.replace(r"[^\d\.\-]", "", regex=True)
-            # keep empty strings as NaN for numeric conversion
-            df.loc[df[dst] == "", dst] = pd.NA
-    # --- end added block ---
-
-    for dst, dtype in norm_types.items():
-        if dst in df.columns:
-            try:
-                if dtype == "datetime64[ns]":
-                    df[dst] = pd.to_datetime(df[dst], errors="coerce")
-                else:
-                    df[dst] = df[dst].astype(dtype)
-            except Exception:
-                if dtype in ("float", "Int64"):
-                    df[dst] = pd.to_numeric(df.get(dst), errors="coerce")
-                    if dtype == "Int64":
-                        try:
-                            df[dst] = df[dst].astype("Int64")
-                        except Exception:
-                            pass
-                else:
-                    df[dst] = df[dst].astype("string")
+    # one pass over the schema (norm_name -> dtype): create missing columns as
+    # null, clean numeric strings, coerce best-effort. Columns are independent,
+    # so they are coerced on a thread pool and assigned back in schema order
+    jobs = []
+    for dst, dtype in plan.dtypes.items():
+        if dst in present:
+            col = df[dst]
+        else:
+            col = pd.Series(now if dst == "ingested_at" else pd.NA, index=df.index)
+        jobs.append((col, dtype))
+    workers = min(COERCE_WORKERS, len(jobs))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            coerced = list(ex.map(_coerce_column, *zip(*jobs)))
+    else:
+        coerced = [_coerce_column(col, dtype) for col, dtype in jobs]
+    for dst, col in zip(plan.dtypes, coerced):
+        df[dst] = col
+    if "ingested_at" not in df.columns:
+        df["ingested_at"] = now
 
     # Compute row hash using project helper (append column 'row_hash')
     try:
@@ -324,11 +582,12 @@ def enforce_schema_and_prepare(df: pd.DataFrame, schema_map: dict) -> pd.DataFra
         else:
             raise RuntimeError("with_row_hash not available")
     except Exception:
-        # stable SHA1 of the joined row values
-        def _sha1_of_row(row):
-            s = "|".join("" if v is None else str(v) for v in row)
-            return hashlib.sha1(s.encode("utf-8")).hexdigest()
-        df["row_hash"] = df.apply(lambda r: _sha1_of_row(r.values), axis=1)
+        # stable hash (ROW_HASH_ALGO, SHA1 by default) of the joined row values:
+        # each column is stringified once, then rows are joined and hashed in a
+        # single pass
+        texts = [_hash_text(df[c]) for c in df.columns]
+        digest = _ROW_HASHERS[ROW_HASH_ALGO]
+        df["row_hash"] = [digest(row.encode("utf-8")) for row in map("|".join, zip(*texts))]
 
     return df
 
@@ -362,16 +621,21 @@ def write_schema_suggestion(schema_map: dict, out_dir: Path = BASE_DIR):
             py_map[actual_header] = (norm_name, dtype)
 
     py_path = out_dir / "suggested_schema.py"
-    with open(py_path, "w", encoding="utf-8") as fh:
-        fh.write("# Suggested SCHEMA_MAP (paste into ingest.py or app.py and edit as needed)\n")
-        fh.write("SCHEMA_MAP = {\n")
-        for k, v in py_map.items():
-            fh.write(f"    {json.dumps(k)}: ({json.dumps(v[0])}, {json.dumps(v[1])}),\n")
-        fh.write("}\n")
+    lines = ["# Suggested SCHEMA_MAP (paste into ingest.py or app.py and edit as needed)", "SCHEMA_MAP = {"]
+    lines += [f"    {json.dumps(k)}: ({json.dumps(v[0])}, {json.dumps(v[1])})," for k, v in py_map.items()]
+    lines.append("}")
+    py_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
     logging.info("Wrote schema suggestion to: %s and %s", json_path, py_path)
 
 
+def _write_schema_suggestion_safe(schema_map: dict):
+    try:
+        write_schema_suggestion(schema_map)
+    except Exception as e:
+        logging.warning("Failed to write schema suggestion files: %s", e)
+
+
 def main():
     if not DOC_ID:
         logging.error("GOOGLE_SHEETS_DOC_ID not set in .env")
@@ -382,7 +646,7 @@ def main():
     init_db(engine)
 
     logging.info(f"[DEBUG] DOC_ID: {DOC_ID}")
-    raw = fetch_sheet(DOC_ID, TAB)
+    raw = fetch_sheet_cached(DOC_ID, TAB, use_cache=SHEET_CACHE)
     if raw is None or raw.empty:
         logging.info("No rows fetched from sheet.")
         return
@@ -390,52 +654,73 @@ def main():
     # build schema map from actual headers
     schema_map = build_schema_map(raw.columns)
 
-    # AUTO-WRITE suggestion files for manual review / edit
-    try:
-        write_schema_suggestion(schema_map)
-    except Exception as e:
-        logging.warning("Failed to write schema suggestion files: %s", e)
+    # AUTO-WRITE suggestion files for manual review / edit, off the critical path
+    suggestion_writer = None
+    if WRITE_SCHEMA_SUGGESTION:
+        suggestion_writer = threading.Thread(
+            target=_write_schema_suggestion_safe, args=(schema_map,), name="schema-suggestion"
+        )
+        suggestion_writer.start()
 
-    df = enforce_schema_and_prepare(raw, schema_map)
+    df = enforce_schema_and_prepare(raw, SchemaPlan.from_map(schema_map))
 
     # (removed legacy mapping for customer_name/amount/status)
 
     # Continue preparing rows for DB upsert...
-    # Prepare rows to upsert: convert timestamps to ISO or native objects depending on DB layer
-    # We convert pandas Timestamp to Python datetime to be safe for SQLAlchemy
-    # Convert pandas Timestamp -> python datetime (safest for SQLAlchemy)
-    for col in df.select_dtypes(include=["datetime64[ns]"]).columns:
-        df[col] = df[col].apply(lambda x: x.to_pydatetime() if pd.notna(x) else None)
-
-    # Ensure missing values become None and numpy/pandas scalars become native Python scalars
-    df = df.where(pd.notna(df), None)
-
-    rows = []
-    for rec in df.to_dict(orient="records"):
-        clean = {}
-        for k, v in rec.items():
-            # treat pandas/np missing as None
-            if pd.isna(v):
-                clean[k] = None
-                continue
-            # pandas/np scalar -> python native
-            if isinstance(v, (np.generic,)):
-                try:
-                    clean[k] = v.item()
-                except Exception:
-                    clean[k] = v
-                continue
-            # leave datetimes and strings intact
-            clean[k] = v
-        rows.append(clean)
+    # pandas Timestamps become Python datetimes and missing values become None
+    # per batch in _record_batches
+    # (safest for SQLAlchemy)
 
     # Upsert into DB table 'sheet_facts' using expected signature: upsert_rows(engine, rows)
+    total = 0
     try:
-        upsert_rows(engine, rows)
-        logging.info("Upserted %d rows to sheet_facts", len(rows))
+        for rows in _record_batches(df):
+            upsert_rows(engine, rows)
+            total += len(rows)
+            if total < len(df):
+                logging.info("Upserted %d/%d rows...", total, len(df))
+        logging.info("Upserted %d rows to sheet_facts", total)
+        # one Parquet partition per ingest run for the columnar readers
+        if write_parquet_partition(df) is not None:
+            compact_parquet_partitions()
     except Exception as e:
-        logging.exception("Failed to upsert rows: %s", e)
+        logging.exception("Failed to upsert rows after %d rows: %s", total, e)
         raise
+    finally:
+        if suggestion_writer is not None:
+            suggestion_writer.join()
+
+
+# infer_dtype results that cannot contain numpy scalars; such object columns
+# (plain text, the common case) skip the per-cell unboxing pass
+_NATIVE_INFERRED = frozenset({"string", "bytes", "empty"})
+
+
+def _native_column(s: pd.Series) -> list:
+    """Column values as Python scalars with every missing value as None."""
+    if s.dtype.kind == "M":
+        # one vectorized Timestamp -> datetime conversion; NaT -> None via the null mask
+        values = np.array(s.dt.to_pydatetime(), dtype=object)
+        values[s.isna().to_numpy()] = None
+        return values.tolist()
+    values = s.to_numpy(dtype=object, na_value=None)
+    if s.dtype == object and pd.api.types.infer_dtype(values, skipna=True) not in _NATIVE_INFERRED:
+        # object columns can still hold numpy scalars from mixed sheet cells
+        return [v.item() if isinstance(v, np.generic) else v for v in values]
+    return values.tolist()
+
+
+def _record_batches(df: pd.DataFrame, size: int = UPSERT_CHUNK):
+    """
+    Yield upsert_rows-ready dicts `size` rows at a time, so only one batch of
+    records is alive while the previous one is written. Values are unboxed
+    once per column and zipped into rows, not cleaned cell by cell.
+    """
+    cols = list(df.columns)
+    for start in range(0, len(df), size):
+        chunk = df.iloc[start:start + size]
+        columns = [_native_column(chunk[c]) for c in cols]
+        yield [dict(zip(cols, row)) for row in zip(*columns)]
 
 if __name__ == "__main__":
     main()
@@ -32,13 +32,16 @@ def insert_samples():
             'sold_date': datetime(2025, 9, 1),
         },
     ]
+    cols = ('row_hash', 'email', 'cnt', 'event', 'theater', 'event_date', 'sold_date')
+    # one multi-row VALUES statement: a single prepare and round trip for all rows
+    placeholders = ", ".join(["(" + ", ".join("?" * len(cols)) + ")"] * len(rows))
+    params = tuple(r[c] for r in rows for c in cols)
     with engine.begin() as conn:
-        for r in rows:
-            # build param list matching columns in table; use INSERT OR REPLACE to upsert
-            conn.exec_driver_sql(
-                "INSERT OR REPLACE INTO sheet_facts (row_hash, email, cnt, event, theater, event_date, sold_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (r['row_hash'], r['email'], r['cnt'], r['event'], r['theater'], r['event_date'], r['sold_date'])
-            )
+        # use INSERT OR REPLACE to upsert
+        conn.exec_driver_sql(
+            f"INSERT OR REPLACE INTO sheet_facts ({', '.join(cols)}) VALUES {placeholders}",
+            params
+        )
     print('inserted sample rows')
 
 if __name__ == '__main__':
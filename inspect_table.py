@@ -14,13 +14,13 @@ cols = [c["name"] for c in insp.get_columns(table)]
 print("Columns:", cols)
 
 with engine.connect() as conn:
-    # count rows
-    total = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+    # row count and non-null count per column in one table scan
+    # (COUNT(col) skips NULLs)
+    counts = ", ".join(f"COUNT([{c}])" for c in cols)
+    total, *non_null = conn.execute(text(f"SELECT COUNT(*), {counts} FROM {table}")).one()
     print("Total rows:", total)
 
-    # non-null count per column (safe)
-    for c in cols:
-        cnt = conn.execute(text(f"SELECT COUNT([{c}]) FROM {table} WHERE [{c}] IS NOT NULL")).scalar()
+    for c, cnt in zip(cols, non_null):
         print(f"  {c:20s} non-null: {cnt}")
 
     # show first 5 rows as pandas DataFrame for quick inspection
@@ -4,9 +4,15 @@ import gspread
 from google.oauth2.service_account import Credentials
 import plotly.express as px
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from google.auth.transport.requests import AuthorizedSession
+import io
+import os
 import re
-from check_account_availability import check_email_availability
+import sheet_cache
+from auth import sheet_revision
+from check_account_availability import _normalize_orders, check_emails_availability
 
 # Configure the page
 st.set_page_config(
@@ -15,6 +21,119 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Opt-in: download each worksheet as CSV from the spreadsheet export endpoint
+# and parse it with pandas instead of reading JSON from the Sheets values API.
+# Exports carry formatted text only, so blanks in numeric columns become NaN.
+SHEETS_CSV_EXPORT = os.getenv("SHEETS_CSV_EXPORT", "0").lower() in ("1", "true", "yes")
+
+
+def make_unique_headers(headers):
+    """Name empty headers Column_<n> and suffix repeats with _1, _2, ..."""
+    unique_headers = []
+    header_counts = {}
+    for i, header in enumerate(headers):
+        # Handle empty headers
+        if not header or header.strip() == "":
+            header = f"Column_{i+1}"
+
+        # Handle duplicate headers
+        original_header = header
+        counter = 0
+        while header in header_counts:
+            counter += 1
+            header = f"{original_header}_{counter}"
+
+        header_counts[header] = True
+        unique_headers.append(header)
+    return unique_headers
+
+
+def sheet_frame(title, values):
+    """Build one worksheet's DataFrame from its raw values, or None when it has no data"""
+    all_values = gspread.utils.fill_gaps(values) if values else []
+    if not all_values:
+        return None
+
+    headers = all_values[0]
+    if len(set(headers)) == len(headers):
+        # what worksheet.get_all_records() returns: row 1 as headers, numbers parsed
+        records = gspread.utils.to_records(
+            headers, [gspread.utils.numericise_all(row) for row in all_values[1:]]
+        )
+        return pd.DataFrame(records) if records else None
+
+    # Duplicate headers: alternative loading method
+    # CORRECT HEADER ROWS:
+    # Accounts: ROW 1 (index 0)
+    # Orders: ROW 4 (index 3)
+    header_idx = 0 if title == 'Accounts' else 3
+    if len(all_values) <= header_idx + 1:
+        st.warning(f"⚠️ '{title}' appears to be empty")
+        return None
+    # Create DataFrame with unique headers and correct data
+    df = pd.DataFrame(all_values[header_idx + 1:], columns=make_unique_headers(all_values[header_idx]))
+    return numeric_columns(df)
+
+
+def export_csv(session, doc_id, worksheet):
+    """One worksheet as CSV bytes from the spreadsheet export endpoint"""
+    resp = session.get(
+        f"https://docs.google.com/spreadsheets/d/{doc_id}/export",
+        params={"format": "csv", "gid": worksheet.id},
+        timeout=60,
+    )
+    resp.raise_for_status()
+    return resp.content
+
+
+def csv_frame(title, data):
+    """sheet_frame for a worksheet exported as CSV bytes"""
+    if not data.strip():
+        return None
+    # every cell as text, as the values API returns it; numbers are typed below
+    raw = pd.read_csv(io.BytesIO(data), header=None, dtype=str, keep_default_na=False, engine="pyarrow")
+
+    headers = raw.iloc[0].tolist()
+    if len(set(headers)) == len(headers):
+        df = raw.iloc[1:]
+        if df.empty:
+            return None
+        df.columns = headers
+        return numeric_columns(df.reset_index(drop=True))
+
+    # Duplicate headers: same header rows as sheet_frame
+    header_idx = 0 if title == 'Accounts' else 3
+    if len(raw) <= header_idx + 1:
+        st.warning(f"⚠️ '{title}' appears to be empty")
+        return None
+    df = raw.iloc[header_idx + 1:].reset_index(drop=True)
+    df.columns = make_unique_headers(raw.iloc[header_idx].tolist())
+    return numeric_columns(df)
+
+
+def numeric_columns(df):
+    """Give columns whose non-blank cells are all numbers a numeric dtype; others stay text"""
+    converted = {}
+    for col in df.columns:
+        text = df[col]
+        filled = text.str.strip() != ""
+        if not filled.any():
+            continue
+        # blanks become NaN; any other cell that fails to parse keeps the column as text
+        num = pd.to_numeric(text.where(filled), errors="coerce")
+        if num.notna().sum() == filled.sum():
+            converted[col] = num
+    return df.assign(**converted) if converted else df
+
+
+def worksheet_values(worksheet):
+    """One worksheet's values, or the exception that stopped the read"""
+    try:
+        return worksheet.get_all_values()
+    except Exception as e:
+        return e
+
+
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def load_google_sheets_data():
     """Load data             emails = [e for e in emails if str(e).strip() != "" and "@" in str(e) and "." in str(e)]om Google Sheets with proper error handling"""
@@ -41,6 +160,18 @@ def load_google_sheets_data():
         # Create credentials with proper scopes
         credentials = Credentials.from_service_account_info(credentials_dict, scopes=scopes)
         
+        # Persistent cache: reuse the saved worksheets while the spreadsheet's
+        # Drive revision is unchanged (st.cache_data stays the in-process layer)
+        cache_folder = None
+        try:
+            cache_folder = sheet_cache.revision_dir(doc_id, "dashboard", sheet_revision(doc_id, credentials))
+            cached = sheet_cache.load_frames(cache_folder)
+            if cached is not None:
+                return cached
+        except Exception:
+            # no Drive access or unreadable cache: load from Sheets
+            cache_folder = None
+        
         # Connect to Google Sheets
         gc = gspread.authorize(credentials)
         
@@ -49,78 +180,59 @@ def load_google_sheets_data():
         
         # Get all worksheets
         worksheets = sheet.worksheets()
-        
+
+        tab_values = None
+        if SHEETS_CSV_EXPORT:
+            # one CSV export per tab, in parallel; any failed export falls
+            # back to the values API for the whole spreadsheet
+            try:
+                session = AuthorizedSession(credentials)
+                with ThreadPoolExecutor(max_workers=min(8, max(len(worksheets), 1))) as pool:
+                    tab_values = list(pool.map(lambda ws: export_csv(session, doc_id, ws), worksheets))
+            except Exception:
+                tab_values = None
+
+        if tab_values is None:
+            # Fetch every worksheet's values in one values.batchGet round trip
+            # instead of one request per tab
+            try:
+                response = sheet.values_batch_get(
+                    [gspread.utils.absolute_range_name(ws.title) for ws in worksheets]
+                )
+                tab_values = [value_range.get("values", []) for value_range in response.get("valueRanges", [])]
+            except Exception:
+                # batchGet failed as a whole: read the tabs one request each, in
+                # parallel since every read is just an HTTPS round trip
+                with ThreadPoolExecutor(max_workers=min(8, max(len(worksheets), 1))) as pool:
+                    tab_values = list(pool.map(worksheet_values, worksheets))
+
         # Load data from each worksheet
         data = {}
-        for worksheet in worksheets:
+        complete = True
+        for worksheet, values in zip(worksheets, tab_values):
             try:
-                # First try getting all records normally
-                try:
-                    records = worksheet.get_all_records()
-                    if records:
-                        df = pd.DataFrame(records)
-                        data[worksheet.title] = df
-                        # Only show success in debug mode
-                        # st.success(f"✅ Loaded '{worksheet.title}': {len(df)} rows")
-                except Exception as header_error:
-                    # If header issue, try alternative method
-                    if "header row" in str(header_error).lower() and "not unique" in str(header_error).lower():
-                        try:
-                            # st.warning(f"⚠️ '{worksheet.title}' has duplicate headers, using alternative loading method...")
-                            
-                            # Get all values and create DataFrame manually
-                            all_values = worksheet.get_all_values()
-                            
-                            # CORRECT HEADER ROWS:
-                            # Accounts: ROW 1 (index 0)
-                            # Orders: ROW 4 (index 3)
-                            if worksheet.title == 'Accounts':
-                                if all_values and len(all_values) > 1:
-                                    headers = all_values[0]  # Row 1 (index 0) for Accounts
-                                    data_rows = all_values[1:]  # Data starts from row 2
-                                else:
-                                    st.warning(f"⚠️ '{worksheet.title}' appears to be empty")
-                                    continue
-                            else:
-                                # For Orders and other sheets: ROW 4
-                                if all_values and len(all_values) > 4:
-                                    headers = all_values[3]  # Row 4 (index 3) for Orders
-                                    data_rows = all_values[4:]  # Data starts from row 5
-                                else:
-                                    st.warning(f"⚠️ '{worksheet.title}' appears to be empty")
-                                    continue
-                                
-                                # Make headers unique and meaningful
-                                unique_headers = []
-                                header_counts = {}
-                                
-                                for i, header in enumerate(headers):
-                                    # Handle empty headers
-                                    if not header or header.strip() == "":
-                                        header = f"Column_{i+1}"
-                                    
-                                    # Handle duplicate headers
-                                    original_header = header
-                                    counter = 0
-                                    while header in header_counts:
-                                        counter += 1
-                                        header = f"{original_header}_{counter}"
-                                    
-                                    header_counts[header] = True
-                                    unique_headers.append(header)
-                                
-                                # Create DataFrame with unique headers and correct data
-                                df = pd.DataFrame(data_rows, columns=unique_headers)
-                                data[worksheet.title] = df
-                        except Exception as fallback_error:
-                            st.error(f"❌ Failed to load '{worksheet.title}': {fallback_error}")
-                    else:
-                        raise header_error
-                        
+                if isinstance(values, Exception):
+                    raise values
+                if isinstance(values, bytes):
+                    df = csv_frame(worksheet.title, values)
+                else:
+                    df = sheet_frame(worksheet.title, values)
+                if df is not None:
+                    data[worksheet.title] = df
+                    # Only show success in debug mode
+                    # st.success(f"✅ Loaded '{worksheet.title}': {len(df)} rows")
             except Exception as e:
                 st.warning(f"❌ Could not load worksheet '{worksheet.title}': {str(e)}")
+                complete = False
                 continue
         
+        # only cache a full load; a failed tab is retried on the next run
+        if cache_folder is not None and data and complete:
+            try:
+                sheet_cache.save_frames(cache_folder, data)
+            except Exception:
+                pass
+        
         return data
         
     except Exception as e:
@@ -137,13 +249,83 @@ def load_google_sheets_data():
             })
         }
 
+_CURRENCY_CHARS = str.maketrans("", "", "$,")
+
+
 def clean_currency_column(df, column_name):
     """Clean currency values like '$1,234.56' to float"""
-    if column_name in df.columns:
-        df[column_name] = df[column_name].astype(str).str.replace('$', '').str.replace(',', '')
-        df[column_name] = pd.to_numeric(df[column_name], errors='coerce')
+    if column_name in df.columns and not pd.api.types.is_numeric_dtype(df[column_name]):
+        # one C-level pass strips '$' and ','; numericised cells are not
+        # strings, so they are kept as they are rather than round-tripped
+        col = df[column_name]
+        stripped = col.str.translate(_CURRENCY_CHARS)
+        # new frame sharing the other columns: the caller's frame is left as is
+        df = df.assign(**{column_name: pd.to_numeric(stripped.where(stripped.notna(), col), errors='coerce')})
     return df
 
+def find_columns(columns, words):
+    """Columns whose name contains any of `words` (case-insensitive)"""
+    return [col for col in columns if any(word in col.lower() for word in words)]
+
+
+@st.cache_data(show_spinner=False)
+def prepare_analytics(df):
+    """Financial columns, their totals and the per-day series for the Analytics page
+
+    Cached on the sheet's contents, so widget reruns reuse the cleaned
+    numbers instead of re-parsing the whole Orders sheet.
+    """
+    revenue_cols = find_columns(df.columns, ['revenue', 'income', 'sales', 'amount', 'total', 'price', 'cost'])
+    cost_cols = find_columns(df.columns, ['cost', 'expense', 'fee', 'charge'])
+    result = {
+        "revenue_cols": revenue_cols,
+        "cost_cols": cost_cols,
+        "revenue_stats": None,
+        "cost_stats": None,
+        "daily_data": None,
+        "time_error": None,
+    }
+    if not (revenue_cols or cost_cols):
+        return result
+    
+    # Clean currency data, then (total, mean) of the first match of each kind
+    for key, cols in (("revenue_stats", revenue_cols), ("cost_stats", cost_cols)):
+        if cols:
+            df = clean_currency_column(df, cols[0])
+            if df[cols[0]].notna().any():
+                result[key] = (df[cols[0]].sum(), df[cols[0]].mean())
+    
+    # Check for date columns for time-based analysis
+    date_cols = find_columns(df.columns, ['date', 'time', 'sold', 'event'])
+    if not date_cols:
+        return result
+    
+    # Use the first available date column
+    date_col = date_cols[0]
+    try:
+        df = df.assign(**{date_col: pd.to_datetime(df[date_col], errors='coerce')})
+        df_time = df.dropna(subset=[date_col])
+        
+        if not df_time.empty:
+            # Group by date and sum values
+            df_time = df_time.assign(date_only=df_time[date_col].dt.date)
+            
+            if revenue_cols and cost_cols:
+                daily_data = df_time.groupby('date_only').agg({
+                    revenue_cols[0]: 'sum',
+                    cost_cols[0]: 'sum'
+                }).reset_index()
+                daily_data['profit'] = daily_data[revenue_cols[0]] - daily_data[cost_cols[0]]
+                result["daily_data"] = daily_data
+            elif revenue_cols:
+                result["daily_data"] = df_time.groupby('date_only').agg({revenue_cols[0]: 'sum'}).reset_index()
+            else:
+                # cost only: the page shows no charts but keeps its layout
+                result["daily_data"] = pd.DataFrame()
+    except Exception as e:
+        result["time_error"] = str(e)
+    return result
+
 # Main navigation
 st.title("🎫 TicketFusion Dashboard")
 st.markdown("---")
@@ -205,18 +387,18 @@ elif app_choice == "Google Sheets Analytics":
     
     # Automatically use Orders data for analytics
     if 'Orders' in sheets_data:
-        df = sheets_data['Orders'].copy()
+        df = sheets_data['Orders']
     else:
         # Fallback to first available sheet
-        df = list(sheets_data.values())[0].copy()
+        df = list(sheets_data.values())[0]
     
     if df.empty:
         st.warning("No order data available for analytics")
         st.stop()
     
-    # Revenue Analysis - more flexible column detection
-    revenue_cols = [col for col in df.columns if any(word in col.lower() for word in ['revenue', 'income', 'sales', 'amount', 'total', 'price', 'cost'])]
-    cost_cols = [col for col in df.columns if any(word in col.lower() for word in ['cost', 'expense', 'fee', 'charge'])]
+    analytics = prepare_analytics(df)
+    revenue_cols = analytics["revenue_cols"]
+    cost_cols = analytics["cost_cols"]
     
     # st.write(f"**Found potential financial columns**: {revenue_cols + cost_cols}")
     
@@ -229,15 +411,10 @@ elif app_choice == "Google Sheets Analytics":
         if revenue_cols:
             with col1:
                 st.write("**Revenue Analysis**")
-                revenue_col = revenue_cols[0]
-                
-                # Clean currency data
-                df = clean_currency_column(df, revenue_col)
                 
-                if df[revenue_col].notna().any():
+                if analytics["revenue_stats"]:
                     # Revenue stats
-                    total_revenue = df[revenue_col].sum()
-                    avg_revenue = df[revenue_col].mean()
+                    total_revenue, avg_revenue = analytics["revenue_stats"]
                     st.metric("Total Revenue", f"${total_revenue:,.2f}")
                     st.metric("Average Revenue", f"${avg_revenue:,.2f}")
         
@@ -245,66 +422,41 @@ elif app_choice == "Google Sheets Analytics":
         if cost_cols:
             with col2:
                 st.write("**Cost Analysis**")
-                cost_col = cost_cols[0]
                 
-                # Clean currency data
-                df = clean_currency_column(df, cost_col)
-                
-                if df[cost_col].notna().any():
+                if analytics["cost_stats"]:
                     # Cost stats
-                    total_cost = df[cost_col].sum()
-                    avg_cost = df[cost_col].mean()
+                    total_cost, avg_cost = analytics["cost_stats"]
                     st.metric("Total Cost", f"${total_cost:,.2f}")
                     st.metric("Average Cost", f"${avg_cost:,.2f}")
         
         # Time-based charts section
         st.subheader("📅 Trends Over Time")
         
-        # Check for date columns for time-based analysis
-        date_cols = [col for col in df.columns if any(word in col.lower() for word in ['date', 'time', 'sold', 'event'])]
-        
-        if date_cols and (revenue_cols or cost_cols):
-            # Use the first available date column
-            date_col = date_cols[0]
-            
-            # Convert to datetime
+        daily_data = analytics["daily_data"]
+        if analytics["time_error"]:
+            st.warning(f"Could not create time-based charts: {analytics['time_error']}")
+        elif daily_data is not None:
             try:
-                df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-                df_time = df.dropna(subset=[date_col]).copy()
+                chart_cols = st.columns(2)
                 
-                if not df_time.empty:
-                    # Group by date and sum values
-                    df_time['date_only'] = df_time[date_col].dt.date
-                    
-                    if revenue_cols and cost_cols:
-                        daily_data = df_time.groupby('date_only').agg({
-                            revenue_cols[0]: 'sum',
-                            cost_cols[0]: 'sum'
-                        }).reset_index()
-                        daily_data['profit'] = daily_data[revenue_cols[0]] - daily_data[cost_cols[0]]
-                    elif revenue_cols:
-                        daily_data = df_time.groupby('date_only').agg({revenue_cols[0]: 'sum'}).reset_index()
-                    
-                    chart_cols = st.columns(2)
-                    
-                    # Revenue over time
-                    if revenue_cols:
-                        with chart_cols[0]:
-                            fig_revenue_time = px.line(daily_data, x='date_only', y=revenue_cols[0],
-                                                     title='Revenue Over Time',
-                                                     labels={'date_only': 'Date', revenue_cols[0]: 'Revenue ($)'})
-                            fig_revenue_time.update_traces(line_color='#1f77b4')
-                            st.plotly_chart(fig_revenue_time, use_container_width=True)
-                    
-                    # Profit over time (if both revenue and cost exist)
-                    if revenue_cols and cost_cols:
-                        with chart_cols[1]:
-                            fig_profit_time = px.line(daily_data, x='date_only', y='profit',
-                                                    title='Profit Over Time',
-                                                    labels={'date_only': 'Date', 'profit': 'Profit ($)'})
-                            fig_profit_time.update_traces(line_color='#2ca02c')
-                            st.plotly_chart(fig_profit_time, use_container_width=True)
-                            
+                # Revenue over time
+                if revenue_cols:
+                    with chart_cols[0]:
+                        fig_revenue_time = px.line(daily_data, x='date_only', y=revenue_cols[0],
+                                                 title='Revenue Over Time',
+                                                 labels={'date_only': 'Date', revenue_cols[0]: 'Revenue ($)'})
+                        fig_revenue_time.update_traces(line_color='#1f77b4')
+                        st.plotly_chart(fig_revenue_time, use_container_width=True)
+                
+                # Profit over time (if both revenue and cost exist)
+                if revenue_cols and cost_cols:
+                    with chart_cols[1]:
+                        fig_profit_time = px.line(daily_data, x='date_only', y='profit',
+                                                title='Profit Over Time',
+                                                labels={'date_only': 'Date', 'profit': 'Profit ($)'})
+                        fig_profit_time.update_traces(line_color='#2ca02c')
+                        st.plotly_chart(fig_profit_time, use_container_width=True)
+                        
             except Exception as e:
                 st.warning(f"Could not create time-based charts: {e}")
     
@@ -321,10 +473,10 @@ elif app_choice == "Account Availability Checker":
     try:
         mapping_df = pd.read_csv('TheaterMapping_v2.csv')
         # Create dictionary: Theater -> Venue Platform
-        for _, row in mapping_df.iterrows():
-            theater_name = row['Theater'].strip()
-            platform_name = row['Venue Platform'].strip()
-            THEATER_PLATFORM_MAPPING[theater_name] = platform_name
+        mapping_df = mapping_df[['Theater', 'Venue Platform']].dropna()
+        THEATER_PLATFORM_MAPPING = dict(zip(
+            mapping_df['Theater'].str.strip(), mapping_df['Venue Platform'].str.strip()
+        ))
     except Exception as e:
         st.sidebar.error(f"❌ Could not load theater mappings: {e}")
         # Fallback to manual mappings if CSV fails
@@ -345,7 +497,7 @@ elif app_choice == "Account Availability Checker":
     existing_events = []
     
     if 'Orders' in sheets_data:
-        orders_df = sheets_data['Orders'].copy()
+        orders_df = sheets_data['Orders']
         
         # Column mapping for Orders data (Row 4 headers, Column O=email, Column Q=theater)
         column_mapping = {
@@ -357,18 +509,17 @@ elif app_choice == "Account Availability Checker":
             'CNT': 'cnt'
         }
         
-        for old_col, new_col in column_mapping.items():
-            if old_col in orders_df.columns:
-                orders_df = orders_df.rename(columns={old_col: new_col})
+        # rename/assign return new frames, so the loaded sheet is never modified
+        orders_df = orders_df.rename(columns=column_mapping)
         
         # Convert date columns
         try:
             if 'sold_date' in orders_df.columns:
-                orders_df['sold_date'] = pd.to_datetime(orders_df['sold_date'], errors='coerce')
+                orders_df = orders_df.assign(sold_date=pd.to_datetime(orders_df['sold_date'], errors='coerce'))
             if 'event_date' in orders_df.columns:
-                orders_df['event_date'] = pd.to_datetime(orders_df['event_date'], errors='coerce')
+                orders_df = orders_df.assign(event_date=pd.to_datetime(orders_df['event_date'], errors='coerce'))
             if 'cnt' in orders_df.columns:
-                orders_df['cnt'] = pd.to_numeric(orders_df['cnt'], errors='coerce')
+                orders_df = orders_df.assign(cnt=pd.to_numeric(orders_df['cnt'], errors='coerce'))
         except Exception as e:
             st.warning(f"Data conversion issues: {e}")
             
@@ -456,7 +607,7 @@ elif app_choice == "Account Availability Checker":
     # Accounts data - Use Accounts tab (the actual tab that exists)
     emails = []
     if 'Accounts' in sheets_data:
-        df = sheets_data['Accounts'].copy()
+        df = sheets_data['Accounts']
         st.write(f"**Accounts Data** ({len(df)} records)")
         
         # Show what columns actually exist for debugging
@@ -529,7 +680,7 @@ elif app_choice == "Account Availability Checker":
     else:
         st.sidebar.error("Accounts tab not found in Google Sheets data")
         # Fallback to Accounts tab format
-        df = sheets_data['Accounts'].copy()
+        df = sheets_data['Accounts']
         
         # For Accounts tab: Column A = Theater, Column C = Email (Row 1 headers)
         if len(df.columns) > 2:
@@ -580,41 +731,30 @@ elif app_choice == "Account Availability Checker":
         
         st.write(f"**Prospective Purchase:** {event or 'Any Event'} at {venue_platform or 'Any Platform'} on {event_date} ({cnt} ticket{'s' if cnt > 1 else ''})")
         
-        # Check availability for each email
-        results = []
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        for i, email in enumerate(emails):
-            status_text.text(f"Checking {i+1}/{len(emails)}: {email}")
-            progress_bar.progress((i + 1) / len(emails))
-            
-            is_available, reasons = check_email_availability(
-                email=email.lower().strip(),
-                orders=orders_df,
-                today=today,
+        # Check availability for all emails in one vectorized pass over the orders
+        keys = [email.lower().strip() for email in emails]
+        with st.spinner(f"Checking {len(emails)} accounts..."):
+            verdicts = check_emails_availability(
+                keys,
+                _normalize_orders(orders_df),
+                today,
                 event=event or None,
                 theater=venue_platform or None,  # Use venue platform instead of theater
                 event_date=pd.Timestamp(event_date) if event_date else None,
                 cnt_new=cnt,
                 sold_date_new=pd.Timestamp(sold_date) if sold_date else None
             )
-            
-            results.append({
-                "email": email,
-                "available": is_available,
-                "reasons": "; ".join(reasons) if reasons else "Available",
-                "event": event or "N/A",
-                "theater": theater or "N/A",
-                "event_date": event_date,
-                "cnt": cnt
-            })
-        
-        status_text.text("✅ Check completed!")
-        progress_bar.empty()
         
         # Display results
-        results_df = pd.DataFrame(results)
+        results_df = pd.DataFrame({
+            "email": list(emails),
+            "available": [verdicts[key][0] for key in keys],
+            "reasons": ["; ".join(verdicts[key][1]) or "Available" for key in keys],
+            "event": event or "N/A",
+            "theater": theater or "N/A",
+            "event_date": event_date,
+            "cnt": cnt
+        })
         
         # Summary statistics
         available_count = results_df["available"].sum()
@@ -652,8 +792,8 @@ elif app_choice == "Account Availability Checker":
         if not unavailable_emails.empty:
             st.subheader("❌ Unavailable Email Addresses")
             with st.expander(f"View {len(unavailable_emails)} unavailable accounts and reasons"):
-                for _, row in unavailable_emails.iterrows():
-                    st.write(f"**{row['email']}**: {row['reasons']}")
+                for email, reasons in zip(unavailable_emails['email'], unavailable_emails['reasons']):
+                    st.write(f"**{email}**: {reasons}")
         
         # Download results
         csv = results_df.to_csv(index=False)
@@ -0,0 +1,80 @@
+# schema.py
+"""Shared sheet_facts schema maps and dtype coercion for the Streamlit apps.
+
+Key = column name in DB (or Google Sheet header), value = (normalized_name, pandas_dtype).
+Set SCHEMA_VARIANT=orders to use the minimal orders sheet layout; the default
+is the full ticketing layout.
+"""
+import os
+
+import pandas as pd
+
+FULL_SCHEMA_MAP = {
+    "Sold Date": ("sold_date", "datetime64[ns]"),
+    "Event Date": ("event_date", "datetime64[ns]"),
+    "Time": ("time", "string"),
+    "Site": ("site", "string"),
+    "Order ID": ("order_id", "Int64"),
+    "Confirm ID": ("confirm_id", "string"),
+    "Revenue": ("revenue", "float"),
+    "Cost": ("cost", "float"),
+    "CNT": ("cnt", "Int64"),
+    "CC": ("cc", "string"),
+    "Purch By": ("purch_by", "string"),
+    "Purch Date": ("purch_date", "datetime64[ns]"),
+    "Trans By": ("trans_by", "string"),
+    "Trans Date": ("trans_date", "datetime64[ns]"),
+    "Email": ("email", "string"),
+    "Event": ("event", "string"),
+    "Theater": ("theater", "string"),
+    "Section": ("section", "string"),
+    "Row": ("row", "string"),
+    "Venue": ("venue", "string"),
+    "Notes": ("notes", "string"),
+}
+
+ORDERS_SCHEMA_MAP = {
+    "Order ID": ("order_id", "Int64"),
+    "Customer Name": ("customer_name", "string"),
+    "Amount": ("amount", "float"),
+    "Status": ("status", "string"),
+}
+
+SCHEMA_MAPS = {"full": FULL_SCHEMA_MAP, "orders": ORDERS_SCHEMA_MAP}
+
+SCHEMA_VARIANT = os.getenv("SCHEMA_VARIANT", "full").strip().lower()
+if SCHEMA_VARIANT not in SCHEMA_MAPS:
+    raise ValueError(f"SCHEMA_VARIANT must be one of {sorted(SCHEMA_MAPS)}, got {SCHEMA_VARIANT!r}")
+SCHEMA_MAP = SCHEMA_MAPS[SCHEMA_VARIANT]
+
+# normalized column -> dtype, built once per process
+DST_DTYPES = {dst: dtype for _, (dst, dtype) in SCHEMA_MAP.items()}
+DST_DTYPES["ingested_at"] = "datetime64[ns]"
+
+
+def coerce_df(df: pd.DataFrame, schema_map: dict = SCHEMA_MAP) -> pd.DataFrame:
+    """Rename sheet headers to normalized names and coerce dtypes per schema_map.
+
+    Columns that fail to convert are left as they are.
+    """
+    rename_map = {src: dst for src, (dst, _) in schema_map.items() if src in df.columns and src != dst}
+    if rename_map:
+        df = df.rename(columns=rename_map)
+
+    dst_dtype = {dst: dtype for _, (dst, dtype) in schema_map.items()}
+    dst_dtype.setdefault("ingested_at", "datetime64[ns]")
+    for col, dtype in dst_dtype.items():
+        if col not in df.columns:
+            continue
+        try:
+            if dtype == "datetime64[ns]":
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+            elif dtype == "Int64":
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
+            elif dtype == "float":
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+            else:
+                df[col] = df[col].astype("string")
+        except Exception:
+            pass
+    return df
@@ -0,0 +1,74 @@
+# sheet_cache.py
+"""
+On-disk cache of fetched sheet data, keyed by the spreadsheet's Drive
+revision (auth.sheet_revision).
+
+Layout: SHEET_CACHE_DIR/<doc id>/<part>/<revision>/, where <part> names what
+was fetched (a tab, the dashboard's worksheets, ...). Each revision folder
+holds one file per frame plus manifest.json, written last so only complete
+copies are read. Saving a revision deletes every other revision of the same
+doc/part, so each keeps at most one copy on disk.
+"""
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent
+SHEET_CACHE_DIR = Path(os.getenv("SHEET_CACHE_DIR", BASE_DIR / ".sheet_cache"))
+
+_UNSAFE_RE = re.compile(r"[^A-Za-z0-9_.-]")
+MANIFEST = "manifest.json"
+
+
+def _safe(name) -> str:
+    return _UNSAFE_RE.sub("_", str(name))
+
+
+def revision_dir(doc_id: str, part: str, revision: str) -> Path:
+    """Folder holding the cached frames of `part` at `revision`."""
+    return SHEET_CACHE_DIR / _safe(doc_id) / _safe(part) / _safe(revision)
+
+
+def load_frames(folder: Path) -> Optional[Dict[str, pd.DataFrame]]:
+    """Frames saved by save_frames in their original order, or None when there is no complete copy."""
+    manifest = folder / MANIFEST
+    if not manifest.exists():
+        return None
+    frames = {}
+    for name, filename in json.loads(manifest.read_text(encoding="utf-8")):
+        path = folder / filename
+        frames[name] = pd.read_parquet(path) if filename.endswith(".parquet") else pd.read_pickle(path)
+    return frames
+
+
+def save_frames(folder: Path, frames: Dict[str, pd.DataFrame]) -> None:
+    """
+    Write `frames` as the cached copy for this revision and delete the other
+    revisions of the same doc/part.
+
+    Typed frames are stored as Parquet. Frames with object columns are
+    pickled: those may mix numbers and text, which Parquet would retype.
+    """
+    folder.mkdir(parents=True, exist_ok=True)
+    manifest = []
+    for i, (name, df) in enumerate(frames.items()):
+        if (df.dtypes == object).any():
+            filename = f"{i:03d}.pkl"
+            df.to_pickle(folder / filename)
+        else:
+            filename = f"{i:03d}.parquet"
+            df.to_parquet(folder / filename, compression="zstd", index=False)
+        manifest.append([name, filename])
+    (folder / MANIFEST).write_text(json.dumps(manifest), encoding="utf-8")
+    for stale in folder.parent.iterdir():
+        if stale == folder:
+            continue
+        if stale.is_dir():
+            shutil.rmtree(stale, ignore_errors=True)
+        else:
+            stale.unlink(missing_ok=True)
@@ -53,6 +53,23 @@ def test_rule2_six_month_window_violation_with_prospective():
     assert any("Rule2" in r for r in reasons)
 
 
+def test_rule2_backdated_prospective_counts_in_its_own_window():
+    today = pd.Timestamp.utcnow()
+    email = "user2b@example.com"
+    rows = [
+        {"email": email, "cnt": 7, "event": "E1", "theater": "T", "event_date": today + pd.Timedelta(days=30),
+         "sold_date": today - pd.Timedelta(days=190), "ingested_at": today - pd.Timedelta(days=190)},
+        {"email": email, "cnt": 1, "event": "E2", "theater": "T", "event_date": today + pd.Timedelta(days=30),
+         "sold_date": today, "ingested_at": today},
+    ]
+    orders = make_orders(rows)
+
+    # prospective 6 tickets sold 200 days ago -> its window also holds the 7 sold 190 days ago
+    ok, reasons = check_email_availability(email, orders, today, event=None, theater=None, event_date=None, cnt_new=6, sold_date_new=today - pd.Timedelta(days=200))
+    assert not ok
+    assert any("Rule2" in r for r in reasons)
+
+
 def test_rule3_multiple_event_dates_violation():
     today = pd.Timestamp.utcnow()
     email = "user3@example.com"
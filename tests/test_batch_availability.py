@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import check_account_availability as caa
+import db
+from check_account_availability import (
+    _normalize_orders,
+    check_email_availability,
+    check_emails_availability,
+    check_emails_availability_parallel,
+)
+
+TODAY = pd.Timestamp("2026-06-01 12:00")
+
+PROSPECTIVE = [
+    dict(),
+    dict(event="E1", theater="T1", event_date=TODAY + pd.Timedelta(days=40), cnt_new=2, sold_date_new=TODAY),
+    dict(event="E2", theater="T2", event_date=TODAY + pd.Timedelta(days=5), cnt_new=4,
+         sold_date_new=TODAY - pd.Timedelta(days=120)),
+]
+
+
+def make_orders(n_emails=60, seed=7):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_emails):
+        email = f"User{i}@Example.com " if i % 5 == 0 else f"user{i}@example.com"
+        for _ in range(rng.integers(0, 8)):
+            rows.append({
+                "email": email,
+                "cnt": int(rng.integers(1, 5)),
+                "event": f"E{rng.integers(1, 4)}",
+                "theater": f"T{rng.integers(1, 3)}",
+                "event_date": TODAY + pd.Timedelta(days=int(rng.integers(-100, 200))),
+                "sold_date": TODAY - pd.Timedelta(days=int(rng.integers(0, 400))),
+                "ingested_at": TODAY,
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module")
+def orders():
+    return make_orders()
+
+
+@pytest.fixture(scope="module")
+def emails():
+    # every account with history plus some without
+    return [f"user{i}@example.com" for i in range(70)]
+
+
+@pytest.mark.parametrize("prospective", PROSPECTIVE)
+def test_batch_matches_single_email_wrapper(orders, emails, prospective):
+    batch = check_emails_availability(emails, _normalize_orders(orders), TODAY, **prospective)
+
+    assert list(batch) == emails
+    for email in emails:
+        assert batch[email] == check_email_availability(email, orders, TODAY, **prospective), email
+
+
+def test_fixture_exercises_every_rule(orders, emails):
+    batch = check_emails_availability(emails, _normalize_orders(orders), TODAY, **PROSPECTIVE[1])
+    reasons = [r for _, rs in batch.values() for r in rs]
+    for rule in ("Rule1", "Rule2", "Rule3"):
+        assert any(r.startswith(rule) for r in reasons), rule
+    assert any(ok for ok, _ in batch.values())
+
+
+@pytest.mark.parametrize("prospective", PROSPECTIVE)
+def test_early_exit_keeps_verdicts_and_stops_at_first_failing_rule(orders, emails, prospective):
+    normalized = _normalize_orders(orders)
+    full = check_emails_availability(emails, normalized, TODAY, **prospective)
+    early = check_emails_availability(emails, normalized, TODAY, early_exit=True, **prospective)
+
+    for email in emails:
+        ok, reasons = full[email]
+        ok_early, reasons_early = early[email]
+        assert ok_early == ok
+        if ok:
+            assert reasons_early == []
+        else:
+            first_rule = reasons[0].split(":")[0]
+            assert reasons_early == [r for r in reasons if r.startswith(first_rule + ":")]
+
+
+def test_parallel_matches_serial(orders, emails, monkeypatch):
+    # small shards so the emails are really split across worker processes
+    monkeypatch.setattr(caa, "MIN_SHARD", 10)
+    normalized = _normalize_orders(orders)
+    prospective = PROSPECTIVE[1]
+
+    serial = check_emails_availability(emails, normalized, TODAY, **prospective)
+    parallel = check_emails_availability_parallel(emails, normalized, TODAY, workers=3, **prospective)
+
+    assert list(parallel) == list(serial)
+    assert parallel == serial
+
+
+def test_parallel_with_one_worker_runs_in_process(orders, emails, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no worker pool expected")
+
+    monkeypatch.setattr(caa, "ProcessPoolExecutor", no_pool)
+    normalized = _normalize_orders(orders)
+    assert check_emails_availability_parallel(emails, normalized, TODAY, workers=1) == check_emails_availability(
+        emails, normalized, TODAY
+    )
+
+
+def test_active_tickets_follow_the_check_date_not_the_load_date(tmp_path):
+    # 8 tickets for an event 10 days after the day the orders were loaded
+    engine = db.get_engine(f"sqlite:///{tmp_path / 'orders.db'}")
+    db.init_db(engine)
+    db.upsert_rows(engine, [{
+        "row_hash": "r1", "email": "late@example.com", "cnt": 8, "event": "E9", "theater": "T9",
+        "event_date": TODAY + pd.Timedelta(days=10), "sold_date": TODAY, "ingested_at": TODAY,
+    }])
+    loaded = caa.load_orders_from_db(engine)
+    emails = ["late@example.com"]
+
+    # still active on TODAY; 30 days later (e.g. a cached frame reused) the event is past
+    assert not check_emails_availability(emails, loaded, TODAY)[emails[0]][0]
+    assert check_emails_availability(emails, loaded, TODAY + pd.Timedelta(days=30))[emails[0]] == (True, [])
+
+
+def test_repeated_emails_are_checked_once(orders):
+    normalized = _normalize_orders(orders)
+    # 8 new tickets fail Rule 1 for any account with active tickets
+    prospective = dict(cnt_new=8)
+    single = check_emails_availability(["user0@example.com"], normalized, TODAY, **prospective)
+    # case/whitespace variants collapse to one key once normalized, as the pages do
+    keys = [e.strip().lower() for e in ["user0@example.com", "User0@Example.com ", "user0@example.com"]]
+
+    batch = check_emails_availability(keys, normalized, TODAY, **prospective)
+    parallel = check_emails_availability_parallel(keys, normalized, TODAY, workers=2, **prospective)
+
+    assert batch == single == parallel
+    assert sum(r.startswith("Rule1") for r in batch["user0@example.com"][1]) == 1
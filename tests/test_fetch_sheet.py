@@ -0,0 +1,58 @@
+import ingest
+
+HEADERS = ["Confirm ID", "Order ID", "Revenue", "Email"]
+
+
+class FakeSheet:
+    """values_batch_get over fixed unformatted rows and formatted columns keyed by range"""
+
+    def __init__(self, unformatted, formatted=None):
+        self.unformatted = unformatted
+        self.formatted = formatted or {}
+        self.calls = []
+
+    def values_batch_get(self, ranges, params=None):
+        self.calls.append((ranges, params))
+        if params["valueRenderOption"] == "UNFORMATTED_VALUE":
+            return {"valueRanges": [{"values": self.unformatted}]}
+        return {"valueRanges": [{"values": [self.formatted[r]]} for r in ranges]}
+
+
+def fetch(monkeypatch, sheet, header_row_idx=None):
+    client = type("Client", (), {"open_by_key": lambda self, key: sheet})()
+    monkeypatch.setattr(ingest, "get_client", lambda: client)
+    monkeypatch.setattr(ingest, "HEADER_ROW_IDX", header_row_idx)
+    return ingest.fetch_sheet("DOC", "Orders")
+
+
+def numeric_confirm_ids():
+    return FakeSheet(
+        [["Report"], HEADERS, [12, 1001, 1234.5, "a@x.com"], ["A-7", 1002, 99, "b@x.com"], [1234]],
+        {"'Orders'!A3:A": ["0012", "A-7", "1,234"]},
+    )
+
+
+def test_text_columns_keep_their_displayed_value(monkeypatch):
+    sheet = numeric_confirm_ids()
+    df = fetch(monkeypatch, sheet)
+
+    assert df["Confirm ID"].tolist() == ["0012", "A-7", "1,234"]
+    # numeric fields keep the unformatted numbers
+    assert df["Order ID"].tolist() == [1001, 1002, ""]
+    assert df["Revenue"].tolist() == [1234.5, 99, ""]
+    # one extra read, for the Confirm ID column only
+    assert len(sheet.calls) == 2
+    assert sheet.calls[1][1]["valueRenderOption"] == "FORMATTED_VALUE"
+
+
+def test_header_override_reads_from_the_same_row(monkeypatch):
+    sheet = numeric_confirm_ids()
+    df = fetch(monkeypatch, sheet, header_row_idx=1)
+    assert df["Confirm ID"].tolist() == ["0012", "A-7", "1,234"]
+
+
+def test_no_extra_read_when_text_columns_hold_text(monkeypatch):
+    sheet = FakeSheet([HEADERS, ["A-1", 1, 2.5, "a@x.com"]])
+    df = fetch(monkeypatch, sheet)
+    assert len(sheet.calls) == 1
+    assert df["Confirm ID"].tolist() == ["A-1"]
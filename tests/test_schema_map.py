@@ -0,0 +1,57 @@
+from ingest import DESIRED_SCHEMA, build_schema_map
+
+SHEET_HEADERS = [alts[0] for name, (alts, _) in DESIRED_SCHEMA.items() if name != "ingested_at"]
+
+
+def normalized(mapping):
+    """header -> normalized name, without the __missing__ placeholders"""
+    return {h: norm for h, (norm, _) in mapping.items() if not h.startswith("__missing__")}
+
+
+def test_exact_headers_map_every_field():
+    mapping = normalized(build_schema_map(SHEET_HEADERS))
+    assert mapping == {alts[0]: name for name, (alts, _) in DESIRED_SCHEMA.items() if name != "ingested_at"}
+
+
+def test_case_and_whitespace_differences_match():
+    mapping = normalized(build_schema_map([" sold date", "EMAIL ", "order id"]))
+    assert mapping == {"sold date": "sold_date", "EMAIL": "email", "order id": "order_id"}
+
+
+def test_fuzzy_matches_close_headers():
+    mapping = normalized(build_schema_map(["Site Name", "Sold", "Emial", "Theatre", "Revnue", "Order"]))
+    assert mapping["Site Name"] == "site"
+    assert mapping["Sold"] == "sold_date"
+    assert mapping["Emial"] == "email"
+    assert mapping["Theatre"] == "theater"
+    assert mapping["Revnue"] == "revenue"
+
+
+def test_missing_field_does_not_take_a_claimed_header():
+    headers = [h for h in SHEET_HEADERS if h != "Trans Date"]
+    mapping = build_schema_map(headers)
+    assert mapping["Sold Date"] == ("sold_date", "datetime64[ns]")
+    assert mapping["Event Date"] == ("event_date", "datetime64[ns]")
+    assert "__missing__:trans_date" in mapping
+
+
+def test_time_is_not_taken_for_ingested_at():
+    mapping = build_schema_map(["Time", "Email"])
+    assert mapping["Time"] == ("time", "string")
+    assert "__missing__:ingested_at" in mapping
+
+
+def test_callers_get_their_own_dict():
+    first = build_schema_map(["Email"])
+    first["Email"] = ("changed", "string")
+    assert build_schema_map(["Email"])["Email"] == ("email", "string")
+
+
+def test_exact_matches_win_over_fuzzy_ones_and_order_follows_schema():
+    headers = ["Sold Date", "Event Date", "Cost", "CNT", "Email", "Event", "Theater", "Ingested At", "Notes"]
+    mapping = build_schema_map(headers)
+    # "Event" is close to "Revenue" but belongs to the event field
+    assert mapping["Event"] == ("event", "string")
+    assert "__missing__:revenue" in mapping
+    # one entry per field, in DESIRED_SCHEMA order
+    assert [norm for norm, _ in mapping.values()] == list(DESIRED_SCHEMA)
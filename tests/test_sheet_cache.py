@@ -0,0 +1,47 @@
+import pandas as pd
+
+import sheet_cache
+
+
+def test_round_trip_keeps_order_and_values(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_DIR", tmp_path)
+    frames = {
+        "Orders": pd.DataFrame({"order_id": pd.array([1, None], dtype="Int64"), "email": ["a@x.com", "b@x.com"]}),
+        "Mixed": pd.DataFrame({"cell": [1, "0012", 2.5]}, dtype=object),
+        "Empty": pd.DataFrame({"revenue": pd.Series([], dtype="float64")}),
+    }
+    folder = sheet_cache.revision_dir("doc/1", "dashboard", "rev:1")
+    assert sheet_cache.load_frames(folder) is None
+
+    sheet_cache.save_frames(folder, frames)
+    loaded = sheet_cache.load_frames(folder)
+
+    assert list(loaded) == list(frames)
+    for name, df in frames.items():
+        pd.testing.assert_frame_equal(loaded[name], df)
+    # object columns are pickled so mixed cell types come back as they were
+    assert [type(v) for v in loaded["Mixed"]["cell"]] == [int, str, float]
+
+
+def test_saving_a_revision_removes_older_ones(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_DIR", tmp_path)
+    frames = {"Accounts": pd.DataFrame({"email": ["a@x.com"]})}
+    old = sheet_cache.revision_dir("doc", "accounts", "r1")
+    other_part = sheet_cache.revision_dir("doc", "dashboard", "r1")
+    sheet_cache.save_frames(old, frames)
+    sheet_cache.save_frames(other_part, frames)
+
+    new = sheet_cache.revision_dir("doc", "accounts", "r2")
+    sheet_cache.save_frames(new, frames)
+
+    assert not old.exists()
+    assert sheet_cache.load_frames(new) is not None
+    assert sheet_cache.load_frames(other_part) is not None
+
+
+def test_incomplete_copy_is_not_read(tmp_path, monkeypatch):
+    monkeypatch.setattr(sheet_cache, "SHEET_CACHE_DIR", tmp_path)
+    folder = sheet_cache.revision_dir("doc", "Orders", "r1")
+    folder.mkdir(parents=True)
+    pd.DataFrame({"a": [1]}).to_parquet(folder / "000.parquet")
+    assert sheet_cache.load_frames(folder) is None
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+import db
+
+
+def make_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "PARQUET_DIR", tmp_path / "parquet")
+    engine = db.get_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    db.init_db(engine)
+    return engine
+
+
+def test_large_int_next_to_none_is_stored_exactly(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path, monkeypatch)
+    big = 9007199254740993  # 2**53 + 1: not representable as float64
+    rows = [
+        {"row_hash": "a", "order_id": big, "confirm_id": "0012", "cnt": np.int64(2)},
+        {"row_hash": "b", "order_id": None, "confirm_id": None, "cnt": None},
+    ]
+    assert db.upsert_rows(engine, rows) == 2
+
+    with engine.connect() as conn:
+        stored = conn.execute(
+            text("SELECT row_hash, order_id, typeof(order_id), confirm_id, cnt FROM sheet_facts ORDER BY row_hash")
+        ).all()
+    assert stored[0] == ("a", big, "integer", "0012", 2)
+    assert stored[1] == ("b", None, "null", None, None)
+
+
+def test_timestamps_and_missing_values_are_converted(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path, monkeypatch)
+    rows = [
+        {"row_hash": "a", "sold_date": pd.Timestamp("2026-01-02 03:04:05"), "revenue": np.float64(1.5)},
+        {"row_hash": "b", "sold_date": pd.NaT, "revenue": np.nan},
+    ]
+    db.upsert_rows(engine, rows)
+
+    with engine.connect() as conn:
+        stored = conn.execute(text("SELECT row_hash, sold_date, revenue FROM sheet_facts ORDER BY row_hash")).all()
+    assert stored[0][1].startswith("2026-01-02 03:04:05")
+    assert stored[0][2] == 1.5
+    assert stored[1][1:] == (None, None)
+
+
+def test_upsert_does_not_write_parquet(tmp_path, monkeypatch):
+    engine = make_engine(tmp_path, monkeypatch)
+    db.upsert_rows(engine, [{"row_hash": "a", "cnt": 1}])
+    assert not (tmp_path / "parquet").exists()
+
+
+def test_compaction_merges_partitions_keeping_latest_rows(tmp_path):
+    for i, rows in enumerate([[("a", 1), ("b", 1)], [("a", 2)], [("c", 3)]]):
+        df = pd.DataFrame(rows, columns=["row_hash", "cnt"])
+        df.to_parquet(tmp_path / f"2026010{i}T000000.parquet", index=False)
+
+    assert db.compact_parquet_partitions(tmp_path, max_partitions=3) is None
+    merged = db.compact_parquet_partitions(tmp_path, max_partitions=2)
+
+    assert sorted(tmp_path.iterdir()) == [merged]
+    assert merged.name == "20260102T000000.parquet"
+    df = db.read_parquet_partitions(["row_hash", "cnt"], tmp_path)
+    assert sorted(zip(df["row_hash"], df["cnt"])) == [("a", 2), ("b", 1), ("c", 3)]